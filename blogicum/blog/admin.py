@@ -1,6 +1,118 @@
+import logging
+from hashlib import md5
+
+from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.db.models.functions import Substr
+from django.template.response import TemplateResponse
+from django.utils.decorators import method_decorator
 
+from .bulk_actions import (
+    bulk_delete_posts,
+    bulk_delete_users,
+    bulk_update_posts,
+    delete_or_queue,
+)
+from .constants import ADMIN_TEXT_LENGTH, INDEX_SCOPE
+from .forms import ImageHeaderField, MoveToCategoryForm, RescheduleForm
+from .mixins import image_upload_view
 from .models import Category, Comment, Location, Post
+from .paginators import CachedCountPaginator
+
+logger = logging.getLogger('blogicum.moderation')
+
+User = get_user_model()
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Filter by typed value instead of listing every option"""
+
+    template = 'admin/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        return ((None, None),)
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.lookup: self.value()})
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'parameter_name': self.parameter_name,
+            'hidden_params': [
+                (name, value)
+                for name, values in changelist.params.items()
+                if name != self.parameter_name
+                for value in values
+            ],
+            'reset_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору'
+    parameter_name = 'author'
+    lookup = 'author__username'
+
+
+class CategoryFilter(InputFilter):
+    title = 'идентификатору категории'
+    parameter_name = 'category'
+    lookup = 'category__slug'
+
+
+class PostFilter(InputFilter):
+    title = 'номеру публикации'
+    parameter_name = 'post'
+    lookup = 'post_id'
+
+
+class CachedCountAdminMixin:
+    """Count changelist rows once per content change instead of
+    on every page view and skip the count of unfiltered rows.
+    """
+
+    show_full_result_count = False
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0,
+        allow_empty_first_page=True
+    ):
+        try:
+            variant = md5(str(queryset.query).encode()).hexdigest()
+        except EmptyResultSet:
+            variant = None
+        return CachedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            count_scope=INDEX_SCOPE if variant else None,
+            count_variant=f'admin:{variant}',
+        )
+
+
+class ShortTextAdminMixin:
+    """Load only the beginning of texts for changelist"""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('text').annotate(
+            text_start=Substr('text', 1, ADMIN_TEXT_LENGTH)
+        )
+
+    @admin.display(description='Текст')
+    def short_text(self, obj):
+        return obj.text_start
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -23,32 +135,204 @@ class CategoryAdmin(admin.ModelAdmin):
     empty_value_display = 'не задано'
 
 
-class PostAdmin(admin.ModelAdmin):
+class BulkActionAdminMixin:
+    """Actions changing rows by set-based batches"""
+
+    bulk_action_template = 'admin/blog/post/bulk_action.html'
+
+    def get_actions(self, request):
+        """Drop default deletion, it loads every dependent row"""
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def progress(self, action):
+        def log_progress(count):
+            logger.info('%s: %s rows processed', action, count)
+        return log_progress
+
+    def ask_parameters(self, request, form_class, title):
+        """Get form with action parameters or a page asking for them"""
+        form = form_class(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            return form, None
+        context = {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'form': form,
+            'opts': self.model._meta,
+            'action': request.POST['action'],
+            'select_across': request.POST.get('select_across', 0),
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'media': self.media + form.media,
+        }
+        request.current_app = self.admin_site.name
+        return None, TemplateResponse(
+            request, self.bulk_action_template, context
+        )
+
+
+class PostAdmin(
+    BulkActionAdminMixin,
+    CachedCountAdminMixin,
+    ShortTextAdminMixin,
+    admin.ModelAdmin
+):
     """Model admin for post"""
 
     list_display = (
         'title',
-        'text',
+        'short_text',
         'pub_date',
         'author',
         'location',
         'category',
         'is_published',
         'created_at',
+        'view_count',
         'image'
     )
     list_editable = (
         'pub_date',
-        'category',
         'is_published',
     )
-    search_fields = ('title',)
-    list_filter = ('author', 'category')
+    list_select_related = ('author', 'location', 'category')
+    search_fields = ('^title',)
+    list_filter = (AuthorFilter, CategoryFilter)
     list_display_links = ('title',)
+    autocomplete_fields = ('author', 'location', 'category')
     empty_value_display = 'не задано'
+    formfield_overrides = {
+        models.ImageField: {'form_class': ImageHeaderField},
+    }
+    actions = (
+        'unpublish',
+        'move_to_category',
+        'reschedule',
+        'delete_with_comments',
+    )
+
+    @method_decorator(image_upload_view)
+    def add_view(self, request, form_url='', extra_context=None):
+        return super().add_view(request, form_url, extra_context)
+
+    @method_decorator(image_upload_view)
+    def change_view(self, request, object_id, form_url='',
+                    extra_context=None):
+        return super().change_view(
+            request, object_id, form_url, extra_context
+        )
+
+    @admin.action(description='Снять с публикации', permissions=('change',))
+    def unpublish(self, request, queryset):
+        count = bulk_update_posts(
+            queryset, self.progress('unpublish'), is_published=False
+        )
+        self.message_user(request, f'Снято с публикации: {count}')
+
+    @admin.action(
+        description='Перенести в категорию', permissions=('change',)
+    )
+    def move_to_category(self, request, queryset):
+        form, response = self.ask_parameters(
+            request, MoveToCategoryForm, 'Перенос в категорию'
+        )
+        if form is None:
+            return response
+        count = bulk_update_posts(
+            queryset,
+            self.progress('move_to_category'),
+            category=form.cleaned_data['category'],
+        )
+        self.message_user(request, f'Перенесено публикаций: {count}')
+
+    @admin.action(
+        description='Изменить время публикации', permissions=('change',)
+    )
+    def reschedule(self, request, queryset):
+        form, response = self.ask_parameters(
+            request, RescheduleForm, 'Изменение времени публикации'
+        )
+        if form is None:
+            return response
+        count = bulk_update_posts(
+            queryset,
+            self.progress('reschedule'),
+            pub_date=form.cleaned_data['pub_date'],
+        )
+        self.message_user(request, f'Изменено время публикаций: {count}')
+
+    @admin.action(
+        description='Удалить вместе с комментариями',
+        permissions=('delete',)
+    )
+    def delete_with_comments(self, request, queryset):
+        form, response = self.ask_parameters(
+            request, forms.Form, 'Удалить публикации вместе с комментариями?'
+        )
+        if form is None:
+            return response
+        count, queued = delete_or_queue(
+            bulk_delete_posts, queryset, self.progress('delete_with_comments')
+        )
+        if queued:
+            self.message_user(
+                request, f'Скрыто и будет удалено в фоне публикаций: {count}'
+            )
+        else:
+            self.message_user(request, f'Удалено публикаций: {count}')
+
+
+class LocationAdmin(admin.ModelAdmin):
+    """Model admin for location"""
+
+    list_display = ('name', 'is_published', 'created_at')
+    search_fields = ('^name',)
+
+
+class CommentAdmin(CachedCountAdminMixin, admin.ModelAdmin):
+    """Model admin for comment"""
+
+    list_display = ('__str__', 'author', 'post', 'created_at')
+    list_select_related = ('author', 'post')
+    list_filter = (AuthorFilter, PostFilter)
+    search_fields = ('=author__username',)
+    autocomplete_fields = ('author', 'post')
+
+
+class BlogUserAdmin(BulkActionAdminMixin, UserAdmin):
+    """User admin deleting users with their content by batches"""
+
+    actions = ('delete_with_content',)
+
+    @admin.action(
+        description='Удалить вместе с публикациями и комментариями',
+        permissions=('delete',)
+    )
+    def delete_with_content(self, request, queryset):
+        form, response = self.ask_parameters(
+            request,
+            forms.Form,
+            'Удалить пользователей вместе с публикациями и комментариями?'
+        )
+        if form is None:
+            return response
+        count, queued = delete_or_queue(
+            bulk_delete_users, queryset, self.progress('delete_with_content')
+        )
+        if queued:
+            self.message_user(
+                request,
+                f'Отключено и будет удалено в фоне пользователей: {count}'
+            )
+        else:
+            self.message_user(request, f'Удалено пользователей: {count}')
 
 
+admin.site.unregister(User)
+admin.site.register(User, BlogUserAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Post, PostAdmin)
-admin.site.register(Location)
-admin.site.register(Comment)
+admin.site.register(Location, LocationAdmin)
+admin.site.register(Comment, CommentAdmin)
@@ -0,0 +1,282 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db.models import Case, Count, Max, When
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from .cache_utils import (
+    category_scope,
+    post_scope,
+    profile_scope,
+    scope_touched_at,
+)
+from .constants import API_MAX_PAGE_LIMIT, API_PAGE_LIMIT, INDEX_SCOPE
+from .mixins import ConditionalGetMixin
+from .models import Category, Comment
+from .query_utils import (
+    after_cursor,
+    base_post_queryset,
+    encode_cursor,
+    latest,
+    posts_last_modified,
+)
+
+User = get_user_model()
+
+
+class ApiError(Exception):
+    """Client error, reported with status 400"""
+
+
+def image_url(name):
+    return default_storage.url(name) if name else None
+
+
+class ApiView(ConditionalGetMixin, View):
+    """Base read-only JSON view.
+    'fields' maps public field names to columns of values() query,
+    'annotations' defines columns which are not model fields,
+    '?fields=' selects only some of public fields.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    fields = {}
+    default_fields = None
+    annotations = {}
+    formatters = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Not found'}, status=404)
+
+    def get_fields(self):
+        """Get public fields requested by client"""
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return self.default_fields or list(self.fields)
+        fields = [field for field in requested.split(',') if field]
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise ApiError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        return fields
+
+    def select(self, queryset, fields, extra_columns=()):
+        """Query only columns of requested fields"""
+        columns = [self.fields[field] for field in fields]
+        annotations = {
+            column: self.annotations[column]
+            for column in columns if column in self.annotations
+        }
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset.values(*dict.fromkeys([*columns, *extra_columns]))
+
+    def serialize(self, row, fields):
+        item = {}
+        for field in fields:
+            value = row[self.fields[field]]
+            formatter = self.formatters.get(field)
+            item[field] = formatter(value) if formatter else value
+        return item
+
+    def get_last_modified(self):
+        return None
+
+
+class ApiListView(ApiView):
+    """Base JSON list view with keyset cursor pagination"""
+
+    ordering = ('-id',)
+
+    def get_queryset(self):
+        raise NotImplementedError('Override get_queryset() in inherited view')
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', API_PAGE_LIMIT))
+        except ValueError:
+            raise ApiError('Limit must be a number')
+        return max(1, min(limit, API_MAX_PAGE_LIMIT))
+
+    def encode_cursor(self, row):
+        return encode_cursor(
+            [row[field.lstrip('-')] for field in self.ordering]
+        )
+
+    def decode_cursor(self, queryset, cursor):
+        """Get filter of rows after the cursor in ordering"""
+        try:
+            return after_cursor(queryset.model, self.ordering, cursor)
+        except ValueError as error:
+            raise ApiError(str(error))
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        limit = self.get_limit()
+        queryset = self.get_queryset().order_by(*self.ordering)
+        cursor = request.GET.get('cursor')
+        if cursor:
+            queryset = queryset.filter(self.decode_cursor(queryset, cursor))
+        rows = list(self.select(
+            queryset,
+            fields,
+            [field.lstrip('-') for field in self.ordering],
+        )[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1])
+        return JsonResponse({
+            'results': [self.serialize(row, fields) for row in rows],
+            'next_cursor': next_cursor,
+        })
+
+
+class ApiDetailView(ApiView):
+
+    def get_queryset(self):
+        raise NotImplementedError('Override get_queryset() in inherited view')
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        row = self.select(self.get_queryset(), fields).first()
+        if row is None:
+            raise Http404
+        return JsonResponse(self.serialize(row, fields))
+
+
+class PostFieldsMixin:
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location_name',
+        'image': 'image',
+        'comment_count': 'comment_count',
+    }
+    default_fields = [
+        'id', 'title', 'pub_date', 'author', 'category', 'comment_count',
+    ]
+    annotations = {
+        'location_name': Case(
+            When(location__is_published=True, then='location__name')
+        ),
+        'comment_count': Count('comments'),
+    }
+    formatters = {'image': image_url}
+
+
+class PostListApiView(PostFieldsMixin, ApiListView):
+    """Visible posts, filtered by ?category= and ?author="""
+
+    ordering = ('-pub_date', '-id')
+
+    def get_scope(self):
+        if self.request.GET.get('category'):
+            return category_scope(self.request.GET['category'])
+        if self.request.GET.get('author'):
+            return profile_scope(self.request.GET['author'])
+        return INDEX_SCOPE
+
+    def get_queryset(self):
+        filters = {}
+        if self.request.GET.get('category'):
+            filters['category__slug'] = self.request.GET['category']
+        if self.request.GET.get('author'):
+            filters['author__username'] = self.request.GET['author']
+        return base_post_queryset().filter(**filters)
+
+    def get_last_modified(self):
+        return latest(
+            posts_last_modified(self.get_queryset()),
+            scope_touched_at(self.get_scope()),
+        )
+
+
+class PostDetailApiView(PostFieldsMixin, ApiDetailView):
+    default_fields = list(PostFieldsMixin.fields)
+
+    def get_queryset(self):
+        return base_post_queryset().filter(pk=self.kwargs['post_id'])
+
+    def get_last_modified(self):
+        return latest(
+            posts_last_modified(self.get_queryset()),
+            scope_touched_at(post_scope(self.kwargs['post_id'])),
+        )
+
+
+class CommentListApiView(ApiListView):
+    """Comments of a visible post in order of creation"""
+
+    fields = {
+        'id': 'id',
+        'text': 'text',
+        'created_at': 'created_at',
+        'author': 'author__username',
+    }
+    ordering = ('created_at', 'id')
+
+    def get_post_queryset(self):
+        return base_post_queryset().filter(pk=self.kwargs['post_id'])
+
+    def get_queryset(self):
+        if not self.get_post_queryset().exists():
+            raise Http404
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
+
+    def get_last_modified(self):
+        return latest(
+            posts_last_modified(self.get_post_queryset()),
+            scope_touched_at(post_scope(self.kwargs['post_id'])),
+        )
+
+
+class CategoryListApiView(ApiListView):
+    """Published categories"""
+
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'slug': 'slug',
+    }
+    ordering = ('id',)
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+    def get_last_modified(self):
+        return latest(
+            Category.objects.aggregate(Max('updated_at'))['updated_at__max'],
+            scope_touched_at(INDEX_SCOPE),
+        )
+
+
+class ProfileApiView(ApiDetailView):
+    """Public profile data of a user"""
+
+    fields = {
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'date_joined': 'date_joined',
+    }
+
+    def get_queryset(self):
+        return User.objects.filter(username=self.kwargs['username'])
+
+    def get_last_modified(self):
+        user = get_object_or_404(User, username=self.kwargs['username'])
+        return latest(
+            user.date_joined,
+            scope_touched_at(profile_scope(user.username)),
+        )
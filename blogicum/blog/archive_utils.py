@@ -0,0 +1,96 @@
+from datetime import datetime
+
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import ArchiveMonth, HomeFeedRow
+
+
+def month_range(year, month):
+    """Get start of the month and start of the next one"""
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def month_of(moment):
+    moment = timezone.localtime(moment)
+    return moment.year, moment.month
+
+
+def months_of(rows):
+    """Get months of home feed rows"""
+    return {
+        (moment.year, moment.month)
+        for moment in rows.datetimes('pub_date', 'month')
+    }
+
+
+def month_rows(year, month):
+    start, end = month_range(year, month)
+    return HomeFeedRow.objects.filter(pub_date__gte=start, pub_date__lt=end)
+
+
+def count_by_month(rows):
+    """Count rows per month with one grouped query"""
+    counts = rows.annotate(
+        month_start=TruncMonth('pub_date')
+    ).order_by().values('month_start').annotate(post_count=Count('pk'))
+    return {
+        (row['month_start'].year, row['month_start'].month): row['post_count']
+        for row in counts
+    }
+
+
+def refresh_archive_months(months):
+    """Recount visible posts of given months.
+    Posts scheduled for later are counted in their month too.
+    """
+    if not months:
+        return
+    ranges = Q()
+    for year, month in months:
+        start, end = month_range(year, month)
+        ranges |= Q(pub_date__gte=start, pub_date__lt=end)
+    counts = count_by_month(HomeFeedRow.objects.filter(ranges))
+    ArchiveMonth.objects.bulk_create(
+        [
+            ArchiveMonth(
+                year=year, month=month, post_count=counts.get((year, month), 0)
+            )
+            for year, month in months
+        ],
+        update_conflicts=True,
+        unique_fields=('year', 'month'),
+        update_fields=('post_count', 'updated_at'),
+    )
+
+
+def rebuild_archive():
+    """Recount every month"""
+    counts = count_by_month(HomeFeedRow.objects.all())
+    ArchiveMonth.objects.all().delete()
+    ArchiveMonth.objects.bulk_create(
+        ArchiveMonth(year=year, month=month, post_count=post_count)
+        for (year, month), post_count in counts.items()
+    )
+
+
+def archive_months():
+    """Get months up to the current one with visible posts"""
+    year, month = month_of(timezone.now())
+    return ArchiveMonth.objects.filter(post_count__gt=0).exclude(
+        year__gt=year
+    ).exclude(year=year, month__gt=month)
+
+
+def month_last_modified(archive_month):
+    """Get the latest change of rows of the month and of its count"""
+    rows = month_rows(archive_month.year, archive_month.month)
+    return max(
+        filter(None, (
+            rows.aggregate(Max('updated_at'))['updated_at__max'],
+            archive_month.updated_at,
+        ))
+    )
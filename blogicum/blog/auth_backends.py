@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache_utils import is_shared_cache
+from .constants import USER_CACHE_KEY
+
+
+def forget_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(pk=user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """Model backend keeping users of sessions in cache,
+    cached user is dropped on every save of the user.
+    Users are cached only in a cache shared by all workers, otherwise
+    a worker would keep a deactivated user until the entry expires.
+    """
+
+    def get_user(self, user_id):
+        if not is_shared_cache():
+            return super().get_user(user_id)
+        key = USER_CACHE_KEY.format(pk=user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,235 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .archive_utils import months_of, refresh_archive_months
+from .auth_backends import forget_user
+from .cache_utils import (
+    category_scope,
+    post_scope,
+    profile_scope,
+    touch_scopes,
+)
+from .constants import INDEX_SCOPE
+from .feed_utils import refresh_feed_entries
+from .home_feed_utils import refresh_home_feed
+from .media_utils import remove_unused_images
+from .models import Comment, HomeFeedRow, PendingDeletion, Post
+from .query_utils import iter_pk_batches
+from .sitemap_utils import mark_dirty
+from .subscription_utils import deliver_posts
+from .warm_utils import warm_after_changes
+
+logger = logging.getLogger('blogicum.moderation')
+
+User = get_user_model()
+
+_deletions = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='bulk-delete'
+)
+
+
+def post_scopes_of(pks):
+    """Get scopes showing any of the posts"""
+    scopes = {INDEX_SCOPE, *(post_scope(pk) for pk in pks)}
+    rows = Post.objects.filter(pk__in=pks).values_list(
+        'author__username', 'category__slug'
+    ).distinct()
+    for username, slug in rows:
+        scopes.add(profile_scope(username))
+        if slug:
+            scopes.add(category_scope(slug))
+    return scopes
+
+
+def posts_changed(pks, scopes=()):
+    """Refresh data derived from posts after set-based changes,
+    signals are not sent for them.
+    """
+    touch_scopes(*post_scopes_of(pks), *scopes)
+    refresh_feed_entries(pks)
+    refresh_home_feed(pks)
+    deliver_posts(pks)
+    mark_dirty('posts', *pks)
+    warm_after_changes()
+
+
+def relations_to_delete(model):
+    """Get reverse relations whose rows depend on the model rows"""
+    return [
+        field for field in model._meta.get_fields(include_hidden=True)
+        if field.auto_created
+        and not field.concrete
+        and (field.one_to_one or field.one_to_many)
+    ]
+
+
+def raw_delete(queryset):
+    """Delete rows and rows depending on them with set-based queries,
+    dependent rows are deleted by batches.
+    Objects are not loaded and signals are not sent.
+    """
+    for relation in relations_to_delete(queryset.model):
+        on_delete = relation.on_delete
+        related = relation.related_model._base_manager.filter(
+            **{f'{relation.field.name}__in': queryset.values('pk')}
+        )
+        if on_delete is models.CASCADE:
+            for batch in iter_pk_batches(related):
+                raw_delete(
+                    related.model._base_manager.filter(pk__in=batch)
+                )
+        elif on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        elif on_delete is not models.DO_NOTHING:
+            raise NotImplementedError(
+                f'{relation} with {on_delete.__name__} is not supported'
+            )
+    return queryset._raw_delete(queryset.db)
+
+
+def bulk_update_posts(queryset, progress=None, **values):
+    """Update posts with one UPDATE per batch, return number of posts.
+    'progress' is called with number of posts processed so far.
+    """
+    updated = 0
+    for batch in iter_pk_batches(queryset):
+        with transaction.atomic():
+            previous_scopes = post_scopes_of(batch)
+            Post.objects.filter(pk__in=batch).update(
+                updated_at=timezone.now(), **values
+            )
+            posts_changed(batch, previous_scopes)
+        updated += len(batch)
+        if progress is not None:
+            progress(updated)
+    return updated
+
+
+def bulk_delete_posts(queryset, progress=None):
+    """Delete posts with their comments by batches, return number of posts"""
+    deleted = 0
+    for batch in iter_pk_batches(queryset):
+        with transaction.atomic():
+            scopes = post_scopes_of(batch)
+            months = months_of(HomeFeedRow.objects.filter(post__in=batch))
+            images = set(
+                Post.objects.filter(pk__in=batch).exclude(
+                    image=''
+                ).values_list('image', flat=True)
+            )
+            raw_delete(Post.objects.filter(pk__in=batch))
+            touch_scopes(*scopes)
+            refresh_archive_months(months)
+            mark_dirty('posts', *batch)
+            transaction.on_commit(partial(remove_unused_images, images))
+        deleted += len(batch)
+        if progress is not None:
+            progress(deleted)
+    return deleted
+
+
+def bulk_delete_users(queryset, progress=None):
+    """Delete users with their posts and comments by batches,
+    return number of users. Comment counters of other posts
+    the users commented are recounted.
+    """
+    deleted = 0
+    for batch in iter_pk_batches(queryset):
+        bulk_delete_posts(Post.objects.filter(author__in=batch))
+        with transaction.atomic():
+            commented = list(
+                Comment.objects.filter(author__in=batch).order_by(
+                ).values_list('post', flat=True).distinct()
+            )
+            scopes = post_scopes_of(commented)
+            usernames = list(
+                User.objects.filter(pk__in=batch).values_list(
+                    'username', flat=True
+                )
+            )
+            raw_delete(User.objects.filter(pk__in=batch))
+            touch_scopes(
+                *scopes, *(profile_scope(name) for name in usernames)
+            )
+            refresh_home_feed(commented)
+            mark_dirty('profiles', *batch)
+        for pk in batch:
+            forget_user(pk)
+        deleted += len(batch)
+        if progress is not None:
+            progress(deleted)
+    return deleted
+
+
+def process_deletion(pending):
+    """Delete rows of the pending deletion and forget it"""
+    model, delete = (
+        (Post, bulk_delete_posts) if pending.kind == PendingDeletion.POSTS
+        else (User, bulk_delete_users)
+    )
+
+    def log_progress(count):
+        logger.info(
+            '%s: %s of %s processed', delete.__name__, count, len(pending.pks)
+        )
+    delete(model.objects.filter(pk__in=pending.pks), log_progress)
+    pending.delete()
+
+
+def run_deletion(pending_pk):
+    """Process the pending deletion in the background thread"""
+    try:
+        pending = PendingDeletion.objects.filter(pk=pending_pk).first()
+        if pending is not None:
+            process_deletion(pending)
+    except Exception:
+        logger.exception('Pending deletion %s failed', pending_pk)
+    finally:
+        connections.close_all()
+
+
+def is_large_deletion(model, pks):
+    """Check if posts or users have too many comments
+    to delete them during the request
+    """
+    if model is Post:
+        comments = Comment.objects.filter(post__in=pks)
+    else:
+        comments = Comment.objects.filter(
+            Q(author__in=pks) | Q(post__author__in=pks)
+        )
+    threshold = settings.BACKGROUND_DELETE_THRESHOLD
+    return comments.values('pk')[:threshold + 1].count() > threshold
+
+
+def delete_or_queue(delete, queryset, progress=None):
+    """Delete posts or users at once if they are small. Otherwise hide
+    them and record the deletion, it runs in the background after
+    the transaction commits, queued deletions run one by one.
+    Return number of rows and whether deletion is queued.
+    """
+    model = queryset.model
+    pks = list(queryset.values_list('pk', flat=True))
+    if not is_large_deletion(model, pks):
+        return delete(queryset, progress), False
+    if model is Post:
+        bulk_update_posts(queryset, is_published=False)
+        kind = PendingDeletion.POSTS
+    else:
+        bulk_update_posts(
+            Post.objects.filter(author__in=pks), is_published=False
+        )
+        queryset.update(is_active=False)
+        for pk in pks:
+            forget_user(pk)
+        kind = PendingDeletion.USERS
+    pending = PendingDeletion.objects.create(kind=kind, pks=pks)
+    transaction.on_commit(partial(_deletions.submit, run_deletion, pending.pk))
+    return len(pks), True
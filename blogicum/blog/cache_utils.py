@@ -0,0 +1,141 @@
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from .constants import (
+    INDEX_SCOPE,
+    LAST_MODIFIED_KEY,
+    SINGLE_FLIGHT_LOCK_KEY,
+    SITE_SCOPE,
+)
+from .models import ScopeVersion
+
+
+def is_process_cache(alias='default'):
+    """Check entries of the cache live in the memory of one process"""
+    return isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def is_shared_cache(alias='default'):
+    """Check every worker sees the same entries of the cache,
+    per-process caches are only shared when the site runs in one process
+    """
+    return settings.SINGLE_PROCESS or not is_process_cache(alias)
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def post_scopes(post):
+    """Get every scope whose pages show the post"""
+    scopes = [
+        INDEX_SCOPE,
+        post_scope(post.pk),
+        profile_scope(post.author.username),
+    ]
+    if post.category_id:
+        scopes.append(category_scope(post.category.slug))
+    return scopes
+
+
+def touch_scopes(*scopes):
+    """Remember the moment content of given scopes has changed.
+    Catches changes invisible to the database, like deleted rows.
+    Moments are kept in the database, so validators never go back
+    after a cache eviction or on another worker.
+    """
+    now = timezone.now()
+    ScopeVersion.objects.bulk_create(
+        [ScopeVersion(scope=scope, touched_at=now) for scope in set(scopes)],
+        update_conflicts=True,
+        unique_fields=('scope',),
+        update_fields=('touched_at',),
+    )
+    if is_shared_cache():
+        cache.set_many(
+            {LAST_MODIFIED_KEY.format(scope=scope): now for scope in scopes},
+            timeout=None,
+        )
+
+
+def scope_touched_at(scope):
+    """Get the latest moment scope or the whole site has changed.
+    Moments are read from the database once and kept in a shared cache,
+    False marks scopes never touched.
+    """
+    keys = {
+        LAST_MODIFIED_KEY.format(scope=name): name
+        for name in (scope, SITE_SCOPE)
+    }
+    shared = is_shared_cache()
+    touched = cache.get_many(keys) if shared else {}
+    missing = [name for key, name in keys.items() if key not in touched]
+    if missing:
+        stored = dict(
+            ScopeVersion.objects.filter(scope__in=missing)
+            .values_list('scope', 'touched_at')
+        )
+        for name in missing:
+            key = LAST_MODIFIED_KEY.format(scope=name)
+            touched[key] = stored.get(name, False)
+            if shared:
+                cache.add(key, touched[key], timeout=None)
+    return max(filter(None, touched.values()), default=None)
+
+
+def expires_early(expires_at, cost, now):
+    """Decide to refresh an entry before it expires. The chance grows
+    towards expiry and with the cost of the rebuild.
+    """
+    beta = settings.EARLY_REFRESH_BETA
+    return now - cost * beta * math.log(1 - random.random()) >= expires_at
+
+
+def single_flight(key, version, build, timeout):
+    """Get value of given version cached under key, building it on a miss.
+    Only the worker holding the lock builds and caches the value, others
+    get the stale value meanwhile. Without one they build the value
+    for themselves at once instead of waiting. Stale values are kept
+    for STALE_TIMEOUT after expiry. The lock lives in the default cache,
+    which is shared by all workers in production.
+    Return the value and whether it is stale.
+    """
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        value, entry_version, expires_at, cost = entry
+        stale = entry_version != version or now >= expires_at
+        if not stale and not expires_early(expires_at, cost, now):
+            return value, False
+    lock = SINGLE_FLIGHT_LOCK_KEY.format(key=key)
+    if cache.add(lock, True, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+        try:
+            started = time.time()
+            value = build()
+            cost = time.time() - started
+            cache.set(
+                key,
+                (value, version, time.time() + timeout, cost),
+                timeout + settings.STALE_TIMEOUT,
+            )
+        finally:
+            cache.delete(lock)
+        return value, False
+    if entry is not None:
+        return value, stale
+    return build(), False
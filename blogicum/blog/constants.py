@@ -1,3 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
 MAX_CHARACTER_LENGTH = 256
 HOME_PAGE_LIMIT = 5
 MAX_STR_METHOD = 20
+MAX_USERNAME_LENGTH = 150
+LAST_MODIFIED_KEY = 'blog:last_modified:{scope}'
+SITE_SCOPE = 'site'
+INDEX_SCOPE = 'index'
+TRENDING_SCOPE = 'trending'
+FEED_LIMIT = 20
+FEED_DESCRIPTION_WORDS = 30
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_INDEX_NAME = 'sitemap.xml'
+EXACT_COUNT_LIMIT = 1000
+COUNT_CACHE_TIMEOUT = 60 * 5
+COUNT_KEY = 'blog:count:{scope}:{variant}'
+API_PAGE_LIMIT = 10
+API_MAX_PAGE_LIMIT = 100
+BULK_BATCH_SIZE = 1000
+ADMIN_TEXT_LENGTH = 50
+EXCERPT_WORDS = 20
+FANOUT_FOLLOWER_LIMIT = 10000
+INBOX_BACKFILL = 50
+POPULAR_KEY = 'blog:popular:{field}:{pk}'
+RATE_LIMIT_KEY = 'blog:rate:{scope}:{client}'
+RATE_LIMIT_LOCK_KEY = '{key}:lock'
+RATE_LIMIT_LOCK_TIMEOUT = 5
+RATE_LIMIT_LOCK_ATTEMPTS = 20
+RATE_LIMIT_LOCK_POLL = 0.01
+USER_CACHE_KEY = 'blog:user:{pk}'
+PAGE_CACHE_KEY = 'blog:page:{page}'
+SINGLE_FLIGHT_LOCK_KEY = '{key}:lock'
+VIEW_FLUSH_SIZE = 10000
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TRENDING_HALF_LIFE = timedelta(days=1)
+TRENDING_VIEW_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 10
+TRENDING_MIN_WEIGHT = 0.1
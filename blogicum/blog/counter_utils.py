@@ -0,0 +1,89 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from .constants import BULK_BATCH_SIZE, VIEW_FLUSH_SIZE
+from .models import Post
+from .trending_utils import add_activity
+
+logger = logging.getLogger('blogicum.views')
+
+
+@transaction.atomic
+def add_views(views):
+    """Add view deltas to posts with one UPDATE per batch.
+    Batches are written together, so views kept after a failure
+    are never counted twice.
+    """
+    items = list(views.items())
+    for start in range(0, len(items), BULK_BATCH_SIZE):
+        batch = dict(items[start:start + BULK_BATCH_SIZE])
+        Post.objects.filter(pk__in=batch).update(
+            view_count=F('view_count') + Case(
+                *(When(pk=pk, then=Value(delta))
+                  for pk, delta in batch.items()),
+                default=Value(0),
+            )
+        )
+        add_activity(views=batch)
+
+
+class ViewCounter:
+    """Views of posts counted in process memory and written as
+    aggregated deltas at most once per VIEW_FLUSH_INTERVAL.
+    A crash loses views of one interval of the process at most.
+    """
+
+    def __init__(self):
+        self.views = Counter()
+        self.lock = threading.Lock()
+        self.flushed_at = time.monotonic()
+
+    def record(self, post_id):
+        with self.lock:
+            self.views[post_id] += 1
+
+    def is_due(self):
+        return (
+            time.monotonic() - self.flushed_at
+            >= settings.VIEW_FLUSH_INTERVAL
+            or len(self.views) >= VIEW_FLUSH_SIZE
+        )
+
+    def take(self):
+        with self.lock:
+            views, self.views = self.views, Counter()
+            self.flushed_at = time.monotonic()
+        return views
+
+    def flush(self):
+        views = self.take()
+        if not views:
+            return
+        try:
+            add_views(views)
+        except Exception:
+            with self.lock:
+                self.views.update(views)
+            logger.exception('Views of %s posts kept for later', len(views))
+
+    def flush_if_due(self):
+        if self.views and self.is_due():
+            self.flush()
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def flush_at_exit():
+    """Best effort on shutdown, the database may be gone already"""
+    with suppress(Exception):
+        add_views(view_counter.take())
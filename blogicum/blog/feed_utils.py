@@ -0,0 +1,98 @@
+from django.db.models import Max
+from django.template.defaultfilters import linebreaksbr
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .constants import FEED_DESCRIPTION_WORDS
+from .models import FeedEntry, Post
+from .query_utils import latest
+
+
+def build_feed_entry(post):
+    """Render post into a feed entry"""
+    category = post.category if post.category_id else None
+    return FeedEntry(
+        post_id=post.pk,
+        title=post.title,
+        link=reverse('blog:post_detail', kwargs={'post_id': post.pk}),
+        description=linebreaksbr(
+            Truncator(post.text).words(FEED_DESCRIPTION_WORDS)
+        ),
+        author_username=post.author.username,
+        category_slug=category.slug if category else None,
+        pub_date=post.pub_date,
+        is_visible=(
+            post.is_published
+            and category is not None
+            and category.is_published
+        ),
+    )
+
+
+def store_feed_entry(post):
+    """Insert or refresh feed entry of the post"""
+    build_feed_entry(post).save()
+
+
+def refresh_feed_entries(post_ids):
+    """Insert or refresh feed entries of many posts at once"""
+    posts = Post.objects.select_related('author', 'category').filter(
+        pk__in=post_ids
+    )
+    FeedEntry.objects.bulk_create(
+        [build_feed_entry(post) for post in posts],
+        update_conflicts=True,
+        unique_fields=('post',),
+        update_fields=(
+            'title',
+            'link',
+            'description',
+            'author_username',
+            'category_slug',
+            'pub_date',
+            'is_visible',
+            'updated_at',
+        ),
+    )
+
+
+def update_category_entries(category, visible=None):
+    """Refresh entries of posts in category after category change"""
+    if visible is None:
+        visible = category.is_published
+    FeedEntry.objects.filter(post__category=category).update(
+        category_slug=category.slug,
+        is_visible=visible,
+        updated_at=timezone.now(),
+    )
+    if visible:
+        FeedEntry.objects.filter(
+            post__category=category, post__is_published=False
+        ).update(is_visible=False)
+
+
+def update_author_entries(user):
+    """Refresh author username in entries of user's posts"""
+    FeedEntry.objects.filter(post__author=user).exclude(
+        author_username=user.username
+    ).update(author_username=user.username, updated_at=timezone.now())
+
+
+def visible_entries(**scope):
+    return FeedEntry.objects.filter(
+        is_visible=True, pub_date__lte=timezone.now(), **scope
+    )
+
+
+def entries_last_modified(**scope):
+    """Get the latest change of entries in scope, including hidden ones.
+    Scheduled posts change the feed when they get published.
+    """
+    changes = FeedEntry.objects.filter(**scope).aggregate(
+        updated=Max('updated_at'),
+    )
+    published = visible_entries(**scope).aggregate(
+        published=Max('pub_date'),
+    )
+    return latest(changes['updated'], published['published'])
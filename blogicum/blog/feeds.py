@@ -0,0 +1,163 @@
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .cache_utils import category_scope, profile_scope, scope_touched_at
+from .constants import FEED_LIMIT, INDEX_SCOPE
+from .feed_utils import entries_last_modified, visible_entries
+from .models import Category
+from .query_utils import latest
+
+User = get_user_model()
+
+
+class StoredEntriesFeed(Feed):
+    """Feed served from the feed entry table with conditional GET support.
+    Entries are filtered by 'scope_field' equal to 'url_kwarg' value.
+    """
+
+    scope_field = None
+    url_kwarg = None
+
+    def get_scope(self, value):
+        if self.scope_field is None:
+            return {}
+        return {self.scope_field: value}
+
+    def get_touched_scope(self, value):
+        return INDEX_SCOPE
+
+    def get_scope_value(self, obj):
+        return None
+
+    def feed_last_modified(self, request, *args, **kwargs):
+        if not hasattr(request, 'feed_last_modified'):
+            value = kwargs.get(self.url_kwarg)
+            request.feed_last_modified = latest(
+                entries_last_modified(**self.get_scope(value)),
+                scope_touched_at(self.get_touched_scope(value)),
+            )
+        return request.feed_last_modified
+
+    def feed_etag(self, request, *args, **kwargs):
+        last_modified = self.feed_last_modified(request, *args, **kwargs)
+        if last_modified is None:
+            return None
+        version = f'{type(self).__name__}:{last_modified.isoformat()}'
+        return md5(version.encode()).hexdigest()
+
+    def __call__(self, request, *args, **kwargs):
+        return condition(
+            etag_func=self.feed_etag,
+            last_modified_func=self.feed_last_modified,
+        )(super().__call__)(request, *args, **kwargs)
+
+    def items(self, obj):
+        scope = self.get_scope(self.get_scope_value(obj))
+        return visible_entries(**scope).order_by('-pub_date')[:FEED_LIMIT]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.description
+
+    def item_link(self, item):
+        return item.link
+
+    def item_author_name(self, item):
+        return item.author_username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+
+class LatestPostsFeed(StoredEntriesFeed):
+    """Latest posts of the whole site"""
+
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsFeed(StoredEntriesFeed):
+    """Latest posts in chosen category"""
+
+    scope_field = 'category_slug'
+    url_kwarg = 'category_slug'
+
+    def get_touched_scope(self, value):
+        return category_scope(value)
+
+    def get_scope_value(self, obj):
+        return obj.slug
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse(
+            'blog:category_posts', kwargs={'category_slug': obj.slug}
+        )
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class ProfilePostsFeed(StoredEntriesFeed):
+    """Latest posts of chosen author"""
+
+    scope_field = 'author_username'
+    url_kwarg = 'username'
+
+    def get_touched_scope(self, value):
+        return profile_scope(value)
+
+    def get_scope_value(self, obj):
+        return obj.username
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации пользователя {obj.username}'
+
+    def description(self, obj):
+        return self.title(obj)
+
+    def link(self, obj):
+        return reverse('blog:profile', kwargs={'username': obj.username})
+
+
+class ProfilePostsAtomFeed(ProfilePostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
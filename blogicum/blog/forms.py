@@ -1,9 +1,12 @@
 from datetime import datetime
+from io import BytesIO
 
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 
-from .models import Post, Comment
+from .models import Category, Comment, Post
 
 User = get_user_model()
 
@@ -21,6 +24,46 @@ class ProfileForm(forms.ModelForm):
         )
 
 
+class ImageHeaderField(forms.ImageField):
+    """Image field reading only format and size from the image header,
+    the image is not decoded in the request. Images of more than
+    IMAGE_MAX_PIXELS pixels are rejected as possible decompression bombs.
+    """
+
+    def to_python(self, data):
+        rejection = getattr(data, 'rejection', None)
+        if rejection is not None:
+            raise ValidationError(rejection, code='rejected')
+        upload = forms.FileField.to_python(self, data)
+        if upload is None:
+            return None
+        from PIL import Image
+        if hasattr(data, 'temporary_file_path'):
+            file = data.temporary_file_path()
+        elif hasattr(data, 'read'):
+            file = BytesIO(data.read())
+        else:
+            file = BytesIO(data['content'])
+        try:
+            with Image.open(file) as image:
+                width, height = image.size
+                image_format = image.format
+        except Exception as error:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            ) from error
+        if width * height > settings.IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                'Изображение слишком большое: %(width)s×%(height)s.',
+                code='too_many_pixels',
+                params={'width': width, 'height': height},
+            )
+        upload.content_type = Image.MIME.get(image_format)
+        if hasattr(upload, 'seek') and callable(upload.seek):
+            upload.seek(0)
+        return upload
+
+
 class PostForm(forms.ModelForm):
     """Form for Post"""
 
@@ -34,6 +77,7 @@ class PostForm(forms.ModelForm):
             'pub_date',
             'image',
         )
+        field_classes = {'image': ImageHeaderField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 attrs={'format': '%d.%m.%Y %H:%M',
@@ -51,3 +95,18 @@ class CommentForm(forms.ModelForm):
         fields = (
             'text',
         )
+
+
+class MoveToCategoryForm(forms.Form):
+    """Form for admin action moving posts to other category"""
+
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        label='Категория'
+    )
+
+
+class RescheduleForm(forms.Form):
+    """Form for admin action changing publication time of posts"""
+
+    pub_date = forms.DateTimeField(label='Дата и время публикации')
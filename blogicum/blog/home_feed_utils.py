@@ -0,0 +1,131 @@
+from django.db.models import Count, F, Max
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .archive_utils import month_of, months_of, refresh_archive_months
+from .constants import EXCERPT_WORDS
+from .models import Category, HomeFeedRow, Location, Post
+from .query_utils import iter_pk_batches, latest
+
+COPIED_FIELDS = {
+    Category: ('slug', 'title', 'is_published'),
+    Location: ('name', 'is_published'),
+}
+
+
+def build_home_feed_row(post):
+    """Denormalize visible post with its comment count"""
+    location = post.location if post.location_id else None
+    return HomeFeedRow(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=Truncator(post.text).words(EXCERPT_WORDS),
+        image=post.image.name or '',
+        author_username=post.author.username,
+        category_slug=post.category.slug,
+        category_title=post.category.title,
+        location_name=(
+            location.name if location and location.is_published else None
+        ),
+        comment_count=post.comment_count,
+    )
+
+
+def refresh_home_feed(post_ids):
+    """Insert, refresh or remove home feed rows of posts"""
+    posts = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).filter(
+        pk__in=post_ids, is_published=True, category__is_published=True
+    ).annotate(comment_count=Count('comments'))
+    rows = [build_home_feed_row(post) for post in posts]
+    existing = HomeFeedRow.objects.filter(post_id__in=post_ids)
+    months = months_of(existing)
+    existing.exclude(post_id__in=[row.post_id for row in rows]).delete()
+    HomeFeedRow.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=('post',),
+        update_fields=(
+            'pub_date',
+            'title',
+            'excerpt',
+            'image',
+            'author_username',
+            'category_slug',
+            'category_title',
+            'location_name',
+            'comment_count',
+            'updated_at',
+        ),
+    )
+    months.update(month_of(row.pub_date) for row in rows)
+    refresh_archive_months(months)
+
+
+def remove_home_feed_rows(rows):
+    """Delete rows and recount their months in the archive"""
+    months = months_of(rows)
+    rows.delete()
+    refresh_archive_months(months)
+
+
+def refresh_home_feed_of(posts):
+    """Refresh rows of many posts by batches"""
+    for batch in iter_pk_batches(posts):
+        refresh_home_feed(batch)
+
+
+def refresh_category_rows(category, changed):
+    """Carry changed fields of the category into rows of its posts.
+    Visibility adds or removes rows by batches, slug and title
+    are updated by one query.
+    """
+    if 'is_published' in changed:
+        if category.is_published:
+            refresh_home_feed_of(category.posts.filter(is_published=True))
+        else:
+            remove_home_feed_rows(
+                HomeFeedRow.objects.filter(post__category=category)
+            )
+    elif changed:
+        HomeFeedRow.objects.filter(post__category=category).update(
+            category_slug=category.slug,
+            category_title=category.title,
+            updated_at=timezone.now(),
+        )
+
+
+def refresh_location_rows(location, changed):
+    """Carry changed name or visibility of the location into rows"""
+    if changed:
+        HomeFeedRow.objects.filter(post__location=location).update(
+            location_name=location.name if location.is_published else None,
+            updated_at=timezone.now(),
+        )
+
+
+def change_comment_count(post_id, delta):
+    """Shift stored comment count of post row"""
+    HomeFeedRow.objects.filter(post_id=post_id).update(
+        comment_count=F('comment_count') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def visible_home_feed():
+    """Get already published home feed rows, newest first"""
+    return HomeFeedRow.objects.filter(
+        pub_date__lte=timezone.now()
+    ).order_by('-pub_date')
+
+
+def home_feed_last_modified():
+    """Get the latest change of home feed rows.
+    Scheduled posts change the feed when they get published.
+    """
+    return latest(
+        HomeFeedRow.objects.aggregate(Max('updated_at'))['updated_at__max'],
+        visible_home_feed().aggregate(Max('pub_date'))['pub_date__max'],
+    )
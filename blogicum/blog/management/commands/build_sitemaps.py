@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import SitemapShard
+from blog.sitemap_utils import (
+    SECTIONS,
+    mark_due_posts_dirty,
+    shard_count,
+    write_index,
+    write_shard,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate sitemap shards changed since the last run and '
+        'the sitemap index. Run it periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Regenerate every shard, not only changed ones',
+        )
+
+    def handle(self, *args, **options):
+        if options['full']:
+            shards = [
+                (section, number)
+                for section in SECTIONS
+                for number in range(shard_count(section))
+            ]
+        else:
+            mark_due_posts_dirty()
+            shards = list(
+                SitemapShard.objects.filter(is_dirty=True).values_list(
+                    'section', 'number'
+                )
+            )
+        for section, number in shards:
+            write_shard(section, number)
+            self.stdout.write(f'Sitemap shard {section}-{number} written')
+        if shards or options['full']:
+            write_index()
+        self.stdout.write(f'Sitemap shards written: {len(shards)}')
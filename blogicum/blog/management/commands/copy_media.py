@@ -0,0 +1,36 @@
+from django.core.files.storage import storages
+from django.core.management.base import BaseCommand
+
+from blog.media_utils import copy_media
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy media files between storages of STORAGES in parallel '
+        'keeping their names, files the target has are skipped. '
+        'Switch the default storage to the target afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Alias of the source storage')
+        parser.add_argument('target', help='Alias of the target storage')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of files copied at once',
+        )
+
+    def handle(self, *args, **options):
+        copied = skipped = 0
+        for batch_copied, batch_skipped in copy_media(
+            storages[options['source']],
+            storages[options['target']],
+            options['workers'],
+        ):
+            copied += batch_copied
+            skipped += batch_skipped
+            self.stdout.write(f'Copied: {copied}, skipped: {skipped}')
+        self.stdout.write(
+            f'Media copied: {copied}, already present: {skipped}'
+        )
@@ -0,0 +1,36 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from blog.constants import BULK_BATCH_SIZE
+from blog.media_utils import orphan_images
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete post images no post refers to. Files saved within '
+        'MEDIA_GC_GRACE are kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List orphans without deleting them',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BULK_BATCH_SIZE,
+            help='Number of files checked with one query',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for name in orphan_images(options['batch_size']):
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+            count += 1
+        verb = 'Found' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f'{verb} orphan images: {count}')
@@ -0,0 +1,45 @@
+from subprocess import CalledProcessError
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.startup_tools import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        'Boot the project in a fresh process and report import time '
+        'per module and app loading time. Fails if boot takes longer '
+        'than STARTUP_TIME_BUDGET.'
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-module',
+            help='Settings to boot with, current ones by default',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Number of slowest modules and packages to show',
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=settings.STARTUP_TIME_BUDGET,
+            help='Boot time budget in seconds',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            profile = profile_startup(options['settings_module'])
+        except CalledProcessError as error:
+            raise CommandError(f'Boot failed:\n{error.stderr}')
+        self.stdout.write(profile.format(options['limit']))
+        if profile.total > options['budget']:
+            raise CommandError(
+                f'Boot takes {profile.total:.2f} s, '
+                f'budget is {options["budget"]:.2f} s'
+            )
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from blogicum.template_tools import render_profile
+
+
+class Command(BaseCommand):
+    help = 'Render pages in process and report render time per template'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Paths of pages')
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='How many times to render every page',
+        )
+        parser.add_argument(
+            '--username',
+            help='Render pages as this user',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Host header allowed by ALLOWED_HOSTS',
+        )
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=options['host'])
+        if options['username']:
+            user = get_user_model().objects.filter(
+                username=options['username']
+            ).first()
+            if user is None:
+                raise CommandError(f'No user {options["username"]}')
+            client.force_login(user)
+        for path in options['paths']:
+            with render_profile() as profile:
+                for _ in range(options['repeat']):
+                    response = client.get(path)
+            self.stdout.write(
+                f'{path} [{response.status_code}] '
+                f'x{options["repeat"]}:\n{profile.format()}'
+            )
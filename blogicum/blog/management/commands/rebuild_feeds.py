@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed_utils import build_feed_entry
+from blog.models import FeedEntry, Post
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Rebuild feed entries of all posts'
+
+    def handle(self, *args, **options):
+        FeedEntry.objects.all().delete()
+        posts = Post.objects.select_related('author', 'category')
+        batch = []
+        created = 0
+        for post in posts.iterator(chunk_size=BATCH_SIZE):
+            batch.append(build_feed_entry(post))
+            if len(batch) == BATCH_SIZE:
+                created += len(FeedEntry.objects.bulk_create(batch))
+                batch = []
+        created += len(FeedEntry.objects.bulk_create(batch))
+        self.stdout.write(f'Feed entries rebuilt: {created}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.archive_utils import rebuild_archive
+from blog.home_feed_utils import refresh_home_feed
+from blog.models import HomeFeedRow, Post
+from blog.query_utils import iter_pk_batches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild home feed rows of all posts and the archive months'
+
+    def handle(self, *args, **options):
+        HomeFeedRow.objects.all().delete()
+        for batch in iter_pk_batches(Post.objects.all()):
+            refresh_home_feed(batch)
+        rebuild_archive()
+        self.stdout.write(
+            f'Home feed rows rebuilt: {HomeFeedRow.objects.count()}'
+        )
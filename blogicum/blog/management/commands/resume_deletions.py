@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.bulk_actions import process_deletion
+from blog.models import PendingDeletion
+
+
+class Command(BaseCommand):
+    help = 'Finish background deletions interrupted by a restart'
+
+    def handle(self, *args, **options):
+        count = 0
+        for pending in PendingDeletion.objects.all():
+            process_deletion(pending)
+            count += 1
+        self.stdout.write(f'Pending deletions finished: {count}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import TrendingScore
+from blog.trending_utils import update_trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Add views and comments logged since the last run to trending '
+        'scores of posts. Run it periodically, e.g. from cron.'
+    )
+
+    def handle(self, *args, **options):
+        update_trending()
+        self.stdout.write(
+            f'Posts with trending score: {TrendingScore.objects.count()}'
+        )
@@ -0,0 +1,55 @@
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.cache_utils import is_process_cache
+from blog.warm_utils import hot_urls, warm_urls
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the first pages of the index and of categories and '
+        'the hot posts to fill a shared cache, e.g. after a deploy'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=settings.WARM_CACHE_PAGES,
+            help='How many first pages of every list to render',
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=settings.WARM_CACHE_POSTS,
+            help='How many hot posts to render',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.WARM_CACHE_WORKERS,
+            help='Size of the thread pool',
+        )
+        parser.add_argument(
+            '--host',
+            default=settings.WARM_CACHE_HOST,
+            help='Host header allowed by ALLOWED_HOSTS',
+        )
+
+    def handle(self, *args, **options):
+        if is_process_cache():
+            raise CommandError(
+                'The default cache lives in this process only, '
+                'configure a shared one like Redis to warm it'
+            )
+        started = perf_counter()
+        urls = hot_urls(options['pages'], options['posts'])
+        results = warm_urls(urls, options['workers'], options['host'])
+        for url, status in results:
+            self.stdout.write(f'{url} [{status}]')
+        self.stdout.write(
+            f'Pages warmed: {len(results)} '
+            f'in {perf_counter() - started:.2f}s'
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.template_tools import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile all templates. Reports compile errors and time; '
+        'web processes warm their own cache with TEMPLATES_PREWARM.'
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        failed = warm_templates()
+        elapsed = time.perf_counter() - start
+        for name, error in failed.items():
+            self.stderr.write(f'{name}: {type(error).__name__}: {error}')
+        self.stdout.write(f'Templates compiled in {elapsed * 1000:.0f} ms')
+        if failed:
+            raise CommandError(f'Templates failed to compile: {len(failed)}')
@@ -0,0 +1,84 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .constants import BULK_BATCH_SIZE
+from .models import Post
+
+
+def is_fresh(name, storage=default_storage):
+    """Check if the file was saved or reused within MEDIA_GC_GRACE,
+    the post referring to it may be not committed yet
+    """
+    grace = timedelta(seconds=settings.MEDIA_GC_GRACE)
+    return storage.get_modified_time(name) > timezone.now() - grace
+
+
+def referenced_images(names):
+    """Get names among given which posts refer to.
+    Posts are counted by the indexed image column, so the count
+    stays right after set-based changes without signals.
+    """
+    return set(
+        Post.objects.filter(image__in=names).values_list('image', flat=True)
+    )
+
+
+def remove_unused_images(names):
+    """Delete image files no post refers to"""
+    names = {name for name in names if name}
+    for name in names - referenced_images(names):
+        if default_storage.exists(name) and not is_fresh(name):
+            default_storage.delete(name)
+
+
+def stored_files(path, storage=default_storage):
+    """Walk files under the storage path in sorted order"""
+    directories, files = storage.listdir(path)
+    for name in sorted(files):
+        yield posixpath.join(path, name)
+    for directory in sorted(directories):
+        yield from stored_files(posixpath.join(path, directory), storage)
+
+
+def orphan_images(batch_size=BULK_BATCH_SIZE, storage=default_storage):
+    """Find stored images no post refers to by batches of files"""
+    upload_to = Post._meta.get_field('image').upload_to
+    if not storage.exists(upload_to):
+        return
+    files = stored_files(upload_to, storage)
+    while batch := list(islice(files, batch_size)):
+        used = referenced_images(batch)
+        for name in batch:
+            if name not in used and not is_fresh(name, storage):
+                yield name
+
+
+def copy_file(source, target, name):
+    """Copy file keeping its name, return False if target has it.
+    Naming rules of the target storage are bypassed, posts refer
+    to the files by their current names.
+    """
+    if target.exists(name):
+        return False
+    with source.open(name) as file:
+        target._save(name, file)
+    return True
+
+
+def copy_media(source, target, workers, batch_size=BULK_BATCH_SIZE):
+    """Copy every file of source storage to target in parallel,
+    yield number of copied and skipped files after each batch
+    """
+    files = stored_files('', source)
+    with ThreadPoolExecutor(workers) as pool:
+        while batch := list(islice(files, batch_size)):
+            copied = sum(pool.map(
+                lambda name: copy_file(source, target, name), batch
+            ))
+            yield copied, len(batch) - copied
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('link', models.CharField(max_length=256, verbose_name='Ссылка')),
+                ('description', models.TextField(verbose_name='Описание')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор публикации')),
+                ('category_slug', models.SlugField(blank=True, null=True, verbose_name='Категория')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('is_visible', models.BooleanField(verbose_name='Видна в лентах')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи лент',
+                'ordering': ('-pub_date',),
+                'indexes': [models.Index(fields=['is_visible', 'pub_date'], name='blog_feeden_is_visi_a4bfbb_idx'), models.Index(fields=['category_slug', 'pub_date'], name='blog_feeden_categor_686317_idx'), models.Index(fields=['author_username', 'pub_date'], name='blog_feeden_author__98b8c6_idx')],
+            },
+        ),
+    ]
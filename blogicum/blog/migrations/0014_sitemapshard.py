@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_feedentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Раздел')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер')),
+                ('is_dirty', models.BooleanField(default=True, verbose_name='Требует обновления')),
+                ('generated_at', models.DateTimeField(blank=True, null=True, verbose_name='Сгенерирован')),
+            ],
+            options={
+                'verbose_name': 'часть карты сайта',
+                'verbose_name_plural': 'Части карты сайта',
+                'ordering': ('section', 'number'),
+                'constraints': [models.UniqueConstraint(fields=('section', 'number'), name='unique_sitemap_shard')],
+            },
+        ),
+    ]
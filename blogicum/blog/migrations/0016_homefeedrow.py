@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeFeedRow',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='home_feed_row', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(db_index=True, verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt', models.TextField(verbose_name='Начало текста')),
+                ('image', models.CharField(blank=True, max_length=100, verbose_name='Фото')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор публикации')),
+                ('category_slug', models.SlugField(verbose_name='Категория')),
+                ('category_title', models.CharField(max_length=256, verbose_name='Заголовок категории')),
+                ('location_name', models.CharField(blank=True, max_length=256, null=True, verbose_name='Название места')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'строка ленты',
+                'verbose_name_plural': 'Строки главной ленты',
+                'ordering': ('-pub_date',),
+            },
+        ),
+    ]
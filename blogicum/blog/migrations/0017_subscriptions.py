@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_homefeedrow'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='blog.post', verbose_name='Публикация')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox', to=settings.AUTH_USER_MODEL, verbose_name='Читатель')),
+            ],
+            options={
+                'verbose_name': 'запись личной ленты',
+                'verbose_name_plural': 'Записи личных лент',
+                'ordering': ('-pub_date',),
+                'indexes': [models.Index(fields=['user', 'pub_date'], name='blog_inboxe_user_id_d6cf05_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'post'), name='unique_inbox_entry')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Subscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='followers', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='followers', to='blog.category', verbose_name='Категория')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to=settings.AUTH_USER_MODEL, verbose_name='Подписчик')),
+            ],
+            options={
+                'verbose_name': 'подписка',
+                'verbose_name_plural': 'Подписки',
+                'ordering': ('-created_at',),
+                'constraints': [models.UniqueConstraint(fields=('subscriber', 'author'), name='unique_author_subscription'), models.UniqueConstraint(fields=('subscriber', 'category'), name='unique_category_subscription'), models.CheckConstraint(condition=models.Q(models.Q(('author__isnull', False), ('category__isnull', True)), models.Q(('author__isnull', True), ('category__isnull', False)), _connector='OR'), name='subscription_has_one_target')],
+            },
+        ),
+    ]
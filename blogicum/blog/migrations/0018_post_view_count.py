@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_subscriptions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Просмотров'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['view_count'], name='blog_post_view_co_9fc812_idx'),
+        ),
+    ]
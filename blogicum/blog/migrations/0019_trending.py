@@ -0,0 +1,41 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_post_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('score', models.FloatField(db_index=True, verbose_name='Рейтинг')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'рейтинг публикации',
+                'verbose_name_plural': 'Рейтинг публикаций',
+                'ordering': ('-score',),
+            },
+        ),
+        migrations.CreateModel(
+            name='PostActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Просмотров')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('post', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'активность',
+                'verbose_name_plural': 'Активность публикаций',
+            },
+        ),
+    ]
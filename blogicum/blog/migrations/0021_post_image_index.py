@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_archivemonth'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, upload_to='post_images', verbose_name='Фото'),
+        ),
+    ]
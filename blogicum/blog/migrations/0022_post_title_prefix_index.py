@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:37
+
+from django.db import migrations
+
+INDEX_NAME = 'blog_post_title_prefix_idx'
+
+PREFIX_INDEXES = {
+    'sqlite': f'CREATE INDEX "{INDEX_NAME}" ON "blog_post" '
+              '("title" COLLATE NOCASE)',
+    'postgresql': f'CREATE INDEX "{INDEX_NAME}" ON "blog_post" '
+                  '(UPPER("title"::text) text_pattern_ops)',
+}
+
+
+def create_prefix_index(apps, schema_editor):
+    sql = PREFIX_INDEXES.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql)
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_post_image_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='blog_post_title_e1c6f7_idx',
+        ),
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_post_title_prefix_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScopeVersion',
+            fields=[
+                ('scope', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Область')),
+                ('touched_at', models.DateTimeField(verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'версия области',
+                'verbose_name_plural': 'Версии областей',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0023_scopeversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('posts', 'Публикации'), ('users', 'Пользователи')], max_length=20, verbose_name='Что удаляется')),
+                ('pks', models.JSONField(verbose_name='Идентификаторы')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'отложенное удаление',
+                'verbose_name_plural': 'Отложенные удаления',
+                'ordering': ('created_at',),
+            },
+        ),
+    ]
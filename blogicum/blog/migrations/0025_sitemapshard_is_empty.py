@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0024_pendingdeletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitemapshard',
+            name='is_empty',
+            field=models.BooleanField(default=False, verbose_name='Пустая'),
+        ),
+    ]
@@ -1,8 +1,41 @@
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.shortcuts import redirect, get_object_or_404
+from django.shortcuts import redirect, get_object_or_404, render
 from django.urls import reverse
+from django.utils.module_loading import import_string
+from django.utils.cache import patch_cache_control
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition
 
 from blog.models import Comment
+from blog.paginators import CachedCountPaginator
+from blog.throttle_utils import client_key, take_token
+from blog.upload_handlers import read_image_uploads
+
+
+def image_upload_view(view):
+    """Read uploads of the view with ImageUploadHandler. Handlers
+    must be set before the body is read, so CSRF is checked
+    after that instead of the middleware. A body too long for any
+    allowed upload is refused with 413 without reading it.
+    """
+    @wraps(view)
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        if request.method == 'POST':
+            handler = read_image_uploads(request)
+            if handler.rejection is not None and handler.file_name is None:
+                return render(
+                    request,
+                    'pages/413.html',
+                    {'reason': handler.rejection},
+                    status=413
+                )
+        return csrf_protect(view)(request, *args, **kwargs)
+    return wrapper
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
@@ -20,6 +53,23 @@ class OnlyAuthorMixin(UserPassesTestMixin):
         )
 
 
+class ImageUploadMixin:
+    """Accept only images as uploads of the view, other views keep
+    the default upload handlers. Put it after mixins refusing
+    the request, the body is read only once they let it through.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """CSRF is checked once the upload handler is set"""
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        return image_upload_view(super().dispatch)(
+            request, *args, **kwargs
+        )
+
+
 class ChangeCommentMixin:
     template_name = 'blog/comment.html'
 
@@ -38,3 +88,110 @@ class ChangeCommentMixin:
             'blog:post_detail',
             kwargs={'post_id': self.kwargs['post_id']}
         )
+
+
+class ConditionalGetMixin:
+    """Answer conditional GET with 304 if page content has not changed"""
+
+    def get_last_modified(self):
+        """Get the latest change of page content"""
+        raise NotImplementedError(
+            'Override get_last_modified() in inherited view'
+        )
+
+    def page_last_modified(self, request, *args, **kwargs):
+        if not hasattr(self, '_last_modified'):
+            self._last_modified = self.get_last_modified()
+        return self._last_modified
+
+    def page_etag(self, request, *args, **kwargs):
+        """Tag page version, pages differ between users"""
+        last_modified = self.page_last_modified(request)
+        if last_modified is None:
+            return None
+        version = ':'.join((
+            last_modified.isoformat(),
+            str(request.user.pk),
+            self.get_etag_variant(),
+        ))
+        return md5(version.encode()).hexdigest()
+
+    def get_etag_variant(self):
+        """Tell apart states of the page for one user, like the follow
+        button rendered into a hole
+        """
+        return ''
+
+    def get_page_variant(self):
+        """Tell apart pages shown at the same address"""
+        return ''
+
+    def get_context_data(self, **kwargs):
+        """Version the page for caching it with holes for every user"""
+        context = super().get_context_data(**kwargs)
+        last_modified = self.page_last_modified(self.request)
+        if last_modified is not None:
+            context['page_cache_key'] = ':'.join((
+                self.request.get_full_path(),
+                self.get_page_variant(),
+            ))
+            context['page_cache_version'] = last_modified.isoformat()
+        return context
+
+    def drop_stale_validators(self, response):
+        """Old version of the page served meanwhile must not be
+        revalidated as the current one
+        """
+        if getattr(self.request, 'served_stale', False):
+            del response['ETag']
+            del response['Last-Modified']
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        response = condition(
+            etag_func=self.page_etag,
+            last_modified_func=self.page_last_modified,
+        )(super().dispatch)(request, *args, **kwargs)
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(self.drop_stale_validators)
+        return response
+
+
+class CachedCountPaginationMixin:
+    """Paginate list of posts counting them once per scope change"""
+
+    paginator_class = CachedCountPaginator
+
+    def get_count_scope(self):
+        """Get scope of posts, count is renewed when scope changes"""
+        return None
+
+    def get_count_variant(self):
+        """Tell apart different querysets over the same scope"""
+        return ''
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args,
+            count_scope=self.get_count_scope(),
+            count_variant=self.get_count_variant(),
+            **kwargs
+        )
+
+
+class RateLimitMixin:
+    """Throttle writes of every client with a token bucket,
+    rates of scopes are set in RATE_LIMITS
+    """
+
+    rate_limit_scope = None
+    rate_limit_methods = ('POST',)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in self.rate_limit_methods:
+            wait = take_token(self.rate_limit_scope, client_key(request))
+            if wait:
+                view = import_string(settings.RATE_LIMIT_VIEW)
+                return view(request, wait)
+        return super().dispatch(request, *args, **kwargs)
@@ -3,15 +3,16 @@ from django.contrib.auth import get_user_model
 
 from .constants import (
     MAX_CHARACTER_LENGTH as MAX_LENGTH,
-    MAX_STR_METHOD as MAX_STR
+    MAX_STR_METHOD as MAX_STR,
+    MAX_USERNAME_LENGTH,
 )
 
 User = get_user_model()
 
 
 class PublishedCreatedModel(models.Model):
-    """Abstract model. Adds flag 'is_published'
-    and time of creation to tables.
+    """Abstract model. Adds flag 'is_published',
+    time of creation and time of last change to tables.
     """
 
     is_published = models.BooleanField(
@@ -20,6 +21,7 @@ class PublishedCreatedModel(models.Model):
         help_text='Снимите галочку, чтобы скрыть публикацию.'
     )
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
 
     class Meta:
         abstract = True
@@ -78,7 +80,9 @@ class Post(PublishedCreatedModel):
 
     title = models.CharField(verbose_name='Заголовок', max_length=MAX_LENGTH)
     text = models.TextField(verbose_name='Текст')
-    image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image = models.ImageField(
+        'Фото', upload_to='post_images', blank=True, db_index=True
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -107,11 +111,20 @@ class Post(PublishedCreatedModel):
         related_name='posts',
         verbose_name='Категория'
     )
+    view_count = models.PositiveIntegerField(
+        verbose_name='Просмотров',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(fields=('pub_date',)),
+            models.Index(fields=('view_count',)),
+        )
 
     def __str__(self):
         return self.title[:MAX_STR]
@@ -141,3 +154,363 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text[:MAX_STR]
+
+
+class HomeFeedRow(models.Model):
+    """Visible post with everything the home page shows,
+    kept in sync with Post. The home page reads it without joins.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='home_feed_row',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата и время публикации',
+        db_index=True
+    )
+    title = models.CharField(verbose_name='Заголовок', max_length=MAX_LENGTH)
+    excerpt = models.TextField(verbose_name='Начало текста')
+    image = models.CharField(verbose_name='Фото', max_length=100, blank=True)
+    author_username = models.CharField(
+        verbose_name='Автор публикации',
+        max_length=MAX_USERNAME_LENGTH
+    )
+    category_slug = models.SlugField(verbose_name='Категория')
+    category_title = models.CharField(
+        verbose_name='Заголовок категории',
+        max_length=MAX_LENGTH
+    )
+    location_name = models.CharField(
+        verbose_name='Название места',
+        max_length=MAX_LENGTH,
+        null=True,
+        blank=True
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Комментариев',
+        default=0
+    )
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'строка ленты'
+        verbose_name_plural = 'Строки главной ленты'
+        ordering = ('-pub_date',)
+
+    def __str__(self):
+        return self.title[:MAX_STR]
+
+    def as_post(self):
+        """Build unsaved post with related objects for templates"""
+        post = Post(
+            id=self.post_id,
+            title=self.title,
+            text=self.excerpt,
+            image=self.image,
+            pub_date=self.pub_date,
+            is_published=True,
+            author=User(username=self.author_username),
+            category=Category(
+                slug=self.category_slug,
+                title=self.category_title,
+                is_published=True,
+            ),
+            location=(
+                Location(name=self.location_name, is_published=True)
+                if self.location_name is not None else None
+            ),
+        )
+        post.comment_count = self.comment_count
+        return post
+
+
+class FeedEntry(models.Model):
+    """Pre-rendered post for syndication feeds, kept in sync with Post.
+    Feeds read it without joins and rendering of post text.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    title = models.CharField(verbose_name='Заголовок', max_length=MAX_LENGTH)
+    link = models.CharField(verbose_name='Ссылка', max_length=MAX_LENGTH)
+    description = models.TextField(verbose_name='Описание')
+    author_username = models.CharField(
+        verbose_name='Автор публикации',
+        max_length=MAX_USERNAME_LENGTH
+    )
+    category_slug = models.SlugField(
+        verbose_name='Категория',
+        null=True,
+        blank=True
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+    is_visible = models.BooleanField(verbose_name='Видна в лентах')
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи лент'
+        ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('is_visible', 'pub_date')),
+            models.Index(fields=('category_slug', 'pub_date')),
+            models.Index(fields=('author_username', 'pub_date')),
+        )
+
+    def __str__(self):
+        return self.title[:MAX_STR]
+
+
+class SitemapShard(models.Model):
+    """Generated sitemap file of a section. Covers objects with ids
+    from number * shard size up to the next shard.
+    """
+
+    section = models.CharField(verbose_name='Раздел', max_length=MAX_STR)
+    number = models.PositiveIntegerField(verbose_name='Номер')
+    is_dirty = models.BooleanField(
+        verbose_name='Требует обновления',
+        default=True
+    )
+    generated_at = models.DateTimeField(
+        verbose_name='Сгенерирован',
+        null=True,
+        blank=True
+    )
+    is_empty = models.BooleanField(verbose_name='Пустая', default=False)
+
+    class Meta:
+        verbose_name = 'часть карты сайта'
+        verbose_name_plural = 'Части карты сайта'
+        ordering = ('section', 'number')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('section', 'number'),
+                name='unique_sitemap_shard'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.section}-{self.number}'
+
+
+class Subscription(models.Model):
+    """User follows either an author or a category"""
+
+    subscriber = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='subscriptions',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='followers',
+        verbose_name='Автор'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='followers',
+        verbose_name='Категория'
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        ordering = ('-created_at',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('subscriber', 'author'),
+                name='unique_author_subscription'
+            ),
+            models.UniqueConstraint(
+                fields=('subscriber', 'category'),
+                name='unique_category_subscription'
+            ),
+            models.CheckConstraint(
+                condition=(
+                    models.Q(author__isnull=False, category__isnull=True)
+                    | models.Q(author__isnull=True, category__isnull=False)
+                ),
+                name='subscription_has_one_target'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.subscriber_id} -> {self.author or self.category}'
+
+
+class InboxEntry(models.Model):
+    """Post delivered to the personal feed of a subscriber"""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='inbox',
+        verbose_name='Читатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись личной ленты'
+        verbose_name_plural = 'Записи личных лент'
+        ordering = ('-pub_date',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='unique_inbox_entry'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('user', 'pub_date')),
+        )
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id}'
+
+
+class PostActivity(models.Model):
+    """Views and comments of a post not yet counted in its trending
+    score. Rows are consumed and deleted by update_trending.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Публикация'
+    )
+    views = models.PositiveIntegerField(verbose_name='Просмотров', default=0)
+    comments = models.PositiveIntegerField(
+        verbose_name='Комментариев',
+        default=0
+    )
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'активность'
+        verbose_name_plural = 'Активность публикаций'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.views}/{self.comments}'
+
+
+class TrendingScore(models.Model):
+    """Time-decayed activity of a post. Scores of all posts decay alike,
+    so instead of decaying them activity is stored grown twice
+    per half-life since the trending epoch, as a logarithm.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Публикация'
+    )
+    score = models.FloatField(verbose_name='Рейтинг', db_index=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'рейтинг публикации'
+        verbose_name_plural = 'Рейтинг публикаций'
+        ordering = ('-score',)
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.2f}'
+
+
+class ArchiveMonth(models.Model):
+    """Number of visible posts published in a month,
+    kept in sync with home feed rows
+    """
+
+    year = models.PositiveSmallIntegerField(verbose_name='Год')
+    month = models.PositiveSmallIntegerField(verbose_name='Месяц')
+    post_count = models.PositiveIntegerField(
+        verbose_name='Публикаций',
+        default=0
+    )
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'месяц архива'
+        verbose_name_plural = 'Месяцы архива'
+        ordering = ('-year', '-month')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('year', 'month'),
+                name='unique_archive_month'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.year}-{self.month:02}'
+
+
+class ScopeVersion(models.Model):
+    """Moment content of a scope has last changed. Catches changes
+    invisible to the database aggregates, like deleted rows.
+    """
+
+    scope = models.CharField(
+        verbose_name='Область',
+        max_length=MAX_LENGTH,
+        primary_key=True
+    )
+    touched_at = models.DateTimeField(verbose_name='Изменено')
+
+    class Meta:
+        verbose_name = 'версия области'
+        verbose_name_plural = 'Версии областей'
+
+    def __str__(self):
+        return self.scope
+
+
+class PendingDeletion(models.Model):
+    """Posts or users hidden at once and deleted in the background.
+    Rows left after a restart are resumed by resume_deletions.
+    """
+
+    POSTS = 'posts'
+    USERS = 'users'
+
+    kind = models.CharField(
+        verbose_name='Что удаляется',
+        max_length=MAX_STR,
+        choices=((POSTS, 'Публикации'), (USERS, 'Пользователи'))
+    )
+    pks = models.JSONField(verbose_name='Идентификаторы')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'отложенное удаление'
+        verbose_name_plural = 'Отложенные удаления'
+        ordering = ('created_at',)
+
+    def __str__(self):
+        return f'{self.kind}: {len(self.pks)}'
@@ -0,0 +1,75 @@
+from django.core.paginator import Page, Paginator
+from django.utils.functional import cached_property
+
+from .cache_utils import scope_touched_at, single_flight
+from .constants import COUNT_CACHE_TIMEOUT, COUNT_KEY, EXACT_COUNT_LIMIT
+
+
+class ElidedPage(Page):
+    """Page which knows a short range of page numbers around itself"""
+
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator which avoids exact COUNT(*) over large scopes.
+    Small scopes are counted exactly with a bounded query, large ones
+    are counted once per change of the scope and cached. The previous
+    count is used while one worker recounts.
+    """
+
+    def __init__(self, *args, count_scope=None, count_variant='', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_scope = count_scope
+        self.count_variant = count_variant
+
+    def count_cheaply(self):
+        """Count up to EXACT_COUNT_LIMIT rows, None if there are more"""
+        rows = self.object_list.order_by().values('pk')
+        count = rows[:EXACT_COUNT_LIMIT + 1].count()
+        return count if count <= EXACT_COUNT_LIMIT else None
+
+    def count_exactly(self):
+        count = self.count_cheaply()
+        if count is None:
+            count = super().count
+        return count
+
+    @cached_property
+    def count(self):
+        if self.count_scope is None:
+            return super().count
+        touched = scope_touched_at(self.count_scope)
+        key = COUNT_KEY.format(
+            scope=self.count_scope,
+            variant=self.count_variant,
+        )
+        count, _ = single_flight(
+            key,
+            touched.isoformat() if touched else '',
+            self.count_exactly,
+            COUNT_CACHE_TIMEOUT,
+        )
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
+
+
+class HomeFeedPaginator(CachedCountPaginator):
+    """Paginator over home feed rows, pages hold posts built from them"""
+
+    def _get_page(self, object_list, *args, **kwargs):
+        return super()._get_page(
+            [row.as_post() for row in object_list], *args, **kwargs
+        )
+
+
+class SubscriptionFeedPaginator(CachedCountPaginator):
+    """Paginator over the subscription feed, counted by its parts"""
+
+    def count_cheaply(self):
+        count = self.object_list.count(EXACT_COUNT_LIMIT)
+        return count if count <= EXACT_COUNT_LIMIT else None
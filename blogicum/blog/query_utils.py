@@ -1,6 +1,13 @@
-from django.db.models import Count
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 
+from .constants import BULK_BATCH_SIZE
 from .models import Post
 
 
@@ -21,3 +28,70 @@ def base_post_queryset(manager=Post.objects, posted=True, comment=False):
             comment_count=Count('comments')
         )
     return queryset
+
+
+def latest(*moments):
+    """Get the latest of given moments, but not one in the future"""
+    moments = [moment for moment in moments if moment is not None]
+    if not moments:
+        return None
+    return min(max(moments), timezone.now())
+
+
+def posts_last_modified(queryset):
+    """Get the latest change of posts in queryset and their comments.
+    Scheduled posts change the page when they get published.
+    """
+    changes = queryset.order_by().aggregate(
+        updated=Max('updated_at'),
+        published=Max('pub_date'),
+        commented=Max('comments__created_at'),
+    )
+    return latest(*changes.values())
+
+
+def iter_pk_batches(queryset, batch_size=BULK_BATCH_SIZE):
+    """Walk pks of queryset in ascending batches.
+    Rows may be changed or deleted between batches.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        batch_query = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        batch = list(batch_query[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]
+
+
+def encode_cursor(values):
+    """Encode ordering values of the last row, keeping full time precision"""
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def after_cursor(model, ordering, cursor):
+    """Get filter of rows after the cursor in ordering.
+    Malformed cursor raises ValueError.
+    """
+    names = [field.lstrip('-') for field in ordering]
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+        values = [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(names, values, strict=True)
+        ]
+    except (ValueError, TypeError, Base64Error, ValidationError):
+        raise ValueError('Invalid cursor')
+    after = Q()
+    for position, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition = Q(**{f'{names[position]}__{lookup}': values[position]})
+        for name, value in zip(names[:position], values[:position]):
+            condition &= Q(**{name: value})
+        after |= condition
+    return after
@@ -0,0 +1,288 @@
+from functools import partial, wraps
+
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .archive_utils import month_of, refresh_archive_months
+from .auth_backends import forget_user
+from .cache_utils import (
+    category_scope,
+    post_scope,
+    post_scopes,
+    profile_scope,
+    touch_scopes,
+)
+from .constants import INDEX_SCOPE, SITE_SCOPE
+from .counter_utils import view_counter
+from .feed_utils import (
+    store_feed_entry,
+    update_author_entries,
+    update_category_entries,
+)
+from .home_feed_utils import (
+    COPIED_FIELDS,
+    change_comment_count,
+    refresh_category_rows,
+    refresh_home_feed,
+    refresh_location_rows,
+    remove_home_feed_rows,
+)
+from .media_utils import remove_unused_images
+from .models import Category, Comment, FeedEntry, HomeFeedRow, Location, Post
+from .sitemap_utils import mark_dirty, mark_section_dirty
+from .subscription_utils import deliver_posts
+from .trending_utils import add_activity
+from .warm_utils import warm_after_changes
+
+User = get_user_model()
+
+
+def skip_raw(handler):
+    """Leave objects loaded from fixtures as they are, derived data
+    is rebuilt by rebuild_feeds and rebuild_home_feed commands
+    """
+    @wraps(handler)
+    def receive(sender, raw=False, **kwargs):
+        if not raw:
+            handler(sender, **kwargs)
+    return receive
+
+
+@receiver(pre_save, sender=Post)
+@skip_raw
+def remember_post_scopes(sender, instance, **kwargs):
+    """Keep scopes the post belonged to before edit, it may leave them,
+    and the image it may replace
+    """
+    instance._previous_scopes = []
+    instance._previous_image = ''
+    if instance.pk is None:
+        return
+    previous = Post.objects.select_related('author', 'category').filter(
+        pk=instance.pk
+    ).first()
+    if previous is not None:
+        instance._previous_scopes = post_scopes(previous)
+        instance._previous_image = previous.image.name
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@skip_raw
+def touch_post_scopes(sender, instance, **kwargs):
+    touch_scopes(
+        *post_scopes(instance),
+        *getattr(instance, '_previous_scopes', ()),
+    )
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def store_post_feed_entry(sender, instance, **kwargs):
+    store_feed_entry(instance)
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def refresh_post_home_feed_row(sender, instance, **kwargs):
+    refresh_home_feed([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def remove_replaced_image(sender, instance, **kwargs):
+    previous = instance._previous_image
+    if previous and previous != instance.image.name:
+        transaction.on_commit(
+            partial(remove_unused_images, {previous})
+        )
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        transaction.on_commit(
+            partial(remove_unused_images, {instance.image.name})
+        )
+
+
+@receiver(post_delete, sender=Post)
+def recount_archive_month(sender, instance, **kwargs):
+    refresh_archive_months({month_of(instance.pub_date)})
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def deliver_post_to_inboxes(sender, instance, **kwargs):
+    deliver_posts([instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@skip_raw
+def count_created_comment(sender, instance, created, **kwargs):
+    if created:
+        change_comment_count(instance.post_id, 1)
+        add_activity(comments={instance.post_id: 1})
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+@skip_raw
+def remember_copied_fields(sender, instance, **kwargs):
+    """Keep fields home feed rows copy, edits of others skip the rows"""
+    instance._previous_copied = None
+    if instance.pk is not None:
+        instance._previous_copied = sender.objects.filter(
+            pk=instance.pk
+        ).values(*COPIED_FIELDS[sender]).first()
+
+
+def changed_copied_fields(instance):
+    previous = getattr(instance, '_previous_copied', None) or {}
+    return {
+        name for name, value in previous.items()
+        if getattr(instance, name) != value
+    }
+
+
+@receiver(post_save, sender=Category)
+@skip_raw
+def refresh_category_home_feed_rows(sender, instance, **kwargs):
+    refresh_category_rows(instance, changed_copied_fields(instance))
+
+
+@receiver(pre_delete, sender=Category)
+def remove_category_home_feed_rows(sender, instance, **kwargs):
+    """Posts of deleted category lose it and get hidden"""
+    remove_home_feed_rows(HomeFeedRow.objects.filter(post__category=instance))
+
+
+@receiver(post_save, sender=Location)
+@skip_raw
+def refresh_location_home_feed_rows(sender, instance, **kwargs):
+    refresh_location_rows(instance, changed_copied_fields(instance))
+
+
+@receiver(pre_delete, sender=Location)
+def clear_location_home_feed_rows(sender, instance, **kwargs):
+    HomeFeedRow.objects.filter(post__location=instance).update(
+        location_name=None
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@skip_raw
+def mark_post_sitemap_dirty(sender, instance, **kwargs):
+    mark_dirty('posts', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@skip_raw
+def mark_category_sitemap_dirty(sender, instance, **kwargs):
+    """Category slug and visibility change addresses of its posts
+    or hide them, other edits leave shards of posts as they are
+    """
+    mark_dirty('categories', instance.pk)
+    if changed_copied_fields(instance) & {'slug', 'is_published'}:
+        mark_section_dirty('posts')
+
+
+@receiver(post_delete, sender=Category)
+def mark_deleted_category_sitemap_dirty(sender, instance, **kwargs):
+    """Posts of deleted category lose it and get hidden"""
+    mark_dirty('categories', instance.pk)
+    mark_section_dirty('posts')
+
+
+@receiver(post_delete, sender=User)
+def mark_profile_sitemap_dirty(sender, instance, **kwargs):
+    mark_dirty('profiles', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@skip_raw
+def update_category_feed_entries(sender, instance, **kwargs):
+    update_category_entries(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_feed_entries(sender, instance, **kwargs):
+    """Posts of deleted category lose it and get hidden"""
+    FeedEntry.objects.filter(post__category=instance).update(
+        category_slug=None, is_visible=False
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@skip_raw
+def touch_comment_scopes(sender, instance, **kwargs):
+    """Comment counters are shown in every list with the post"""
+    scopes = [INDEX_SCOPE, post_scope(instance.post_id)]
+    post = Post.objects.filter(pk=instance.post_id).values(
+        'author__username', 'category__slug'
+    ).first()
+    if post is not None:
+        scopes.append(profile_scope(post['author__username']))
+        if post['category__slug']:
+            scopes.append(category_scope(post['category__slug']))
+    touch_scopes(*scopes)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@skip_raw
+def touch_site(sender, instance, created=False, **kwargs):
+    """Categories and locations are shown on every page with posts,
+    edits of fields not shown there leave pages as they are
+    """
+    if kwargs['signal'] is post_save and not (
+        created or changed_copied_fields(instance)
+    ):
+        return
+    touch_scopes(SITE_SCOPE)
+    warm_after_changes()
+
+
+@receiver(post_save, sender=User)
+@skip_raw
+def touch_user_pages(sender, instance, update_fields=None, **kwargs):
+    """Usernames are shown on every page, skip saves on login"""
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    touch_scopes(SITE_SCOPE, profile_scope(instance.username))
+    update_author_entries(instance)
+    HomeFeedRow.objects.filter(post__author=instance).exclude(
+        author_username=instance.username
+    ).update(author_username=instance.username)
+    mark_dirty('profiles', instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@skip_raw
+def forget_cached_user(sender, instance, **kwargs):
+    """Profile edits and password changes must reach the next request"""
+    forget_user(instance.pk)
+
+
+@receiver(request_finished)
+def flush_view_counts(sender, **kwargs):
+    """Write buffered views after the response is sent"""
+    view_counter.flush_if_due()
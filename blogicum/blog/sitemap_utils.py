@@ -0,0 +1,173 @@
+import gzip
+import os
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+from .constants import SITEMAP_INDEX_NAME, SITEMAP_SHARD_SIZE
+from .models import Category, Post, SitemapShard
+from .query_utils import base_post_queryset
+
+User = get_user_model()
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def post_entries(start, stop):
+    posts = base_post_queryset().filter(
+        pk__gte=start, pk__lt=stop
+    ).order_by('pk').values_list('pk', 'updated_at')
+    for pk, updated_at in posts.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:post_detail', kwargs={'post_id': pk}), updated_at
+
+
+def category_entries(start, stop):
+    categories = Category.objects.filter(
+        is_published=True, pk__gte=start, pk__lt=stop
+    ).order_by('pk').values_list('slug', 'updated_at')
+    for slug, updated_at in categories.iterator(
+        chunk_size=ITERATOR_CHUNK_SIZE
+    ):
+        yield reverse(
+            'blog:category_posts', kwargs={'category_slug': slug}
+        ), updated_at
+
+
+def profile_entries(start, stop):
+    users = User.objects.filter(
+        is_active=True, pk__gte=start, pk__lt=stop
+    ).order_by('pk').values_list('username', flat=True)
+    for username in users.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:profile', kwargs={'username': username}), None
+
+
+SECTIONS = {
+    'posts': (Post, post_entries),
+    'categories': (Category, category_entries),
+    'profiles': (User, profile_entries),
+}
+
+
+def shard_name(section, number):
+    return f'{section}-{number}.xml.gz'
+
+
+def absolute_url(location):
+    return settings.SITE_URL.rstrip('/') + location
+
+
+def url_element(tag, location, lastmod=None):
+    element = f'<{tag}><loc>{escape(absolute_url(location))}</loc>'
+    if lastmod is not None:
+        element += f'<lastmod>{lastmod.isoformat()}</lastmod>'
+    return element + f'</{tag}>\n'
+
+
+def write_atomically(name, lines, compress=True):
+    """Stream lines into a file under SITEMAP_ROOT and replace the old one"""
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    path = os.path.join(settings.SITEMAP_ROOT, name)
+    temp_path = f'{path}.tmp'
+    opener = gzip.open if compress else open
+    with opener(temp_path, 'wt', encoding='utf-8') as file:
+        file.writelines(lines)
+    os.replace(temp_path, path)
+
+
+def shard_count(section):
+    model, _ = SECTIONS[section]
+    max_pk = model.objects.aggregate(Max('pk'))['pk__max']
+    if max_pk is None:
+        return 0
+    return max_pk // SITEMAP_SHARD_SIZE + 1
+
+
+def write_shard(section, number):
+    """Regenerate sitemap file of the shard.
+    The shard is marked clean before reading, so changes made
+    during generation mark it dirty again.
+    """
+    _, entries = SECTIONS[section]
+    SitemapShard.objects.update_or_create(
+        section=section, number=number, defaults={'is_dirty': False}
+    )
+    start = number * SITEMAP_SHARD_SIZE
+    count = 0
+
+    def lines():
+        nonlocal count
+        yield XML_HEADER + f'<urlset xmlns="{XMLNS}">\n'
+        for location, lastmod in entries(start, start + SITEMAP_SHARD_SIZE):
+            count += 1
+            yield url_element('url', location, lastmod)
+        yield '</urlset>\n'
+
+    write_atomically(shard_name(section, number), lines())
+    SitemapShard.objects.filter(section=section, number=number).update(
+        generated_at=timezone.now(), is_empty=not count
+    )
+
+
+def write_index():
+    """Write the index of generated shards, empty ones are left out"""
+    shards = SitemapShard.objects.filter(
+        generated_at__isnull=False, is_empty=False
+    )
+
+    def lines():
+        yield XML_HEADER + f'<sitemapindex xmlns="{XMLNS}">\n'
+        for shard in shards.iterator():
+            yield url_element(
+                'sitemap',
+                reverse(
+                    'blog:sitemap_shard',
+                    kwargs={'path': shard_name(shard.section, shard.number)}
+                ),
+                shard.generated_at,
+            )
+        yield '</sitemapindex>\n'
+
+    write_atomically(SITEMAP_INDEX_NAME, lines(), compress=False)
+
+
+def mark_dirty(section, *pks):
+    """Mark shards holding objects with given pks for regeneration"""
+    numbers = {pk // SITEMAP_SHARD_SIZE for pk in pks}
+    SitemapShard.objects.bulk_create(
+        [SitemapShard(section=section, number=number) for number in numbers],
+        update_conflicts=True,
+        unique_fields=('section', 'number'),
+        update_fields=('is_dirty',),
+    )
+
+
+def mark_due_posts_dirty():
+    """Mark shards holding posts whose publication time has come
+    since the shard was generated, saving a scheduled post
+    marks its shard too early
+    """
+    now = timezone.now()
+    shards = SitemapShard.objects.filter(
+        section='posts', is_dirty=False, generated_at__lt=now
+    ).values_list('number', 'generated_at')
+    due = [
+        number for number, generated_at in shards
+        if base_post_queryset().filter(
+            pk__gte=number * SITEMAP_SHARD_SIZE,
+            pk__lt=(number + 1) * SITEMAP_SHARD_SIZE,
+            pub_date__gt=generated_at,
+        ).exists()
+    ]
+    SitemapShard.objects.filter(section='posts', number__in=due).update(
+        is_dirty=True
+    )
+
+
+def mark_section_dirty(section):
+    SitemapShard.objects.filter(section=section).update(is_dirty=True)
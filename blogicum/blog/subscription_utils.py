@@ -0,0 +1,210 @@
+from collections import defaultdict
+from hashlib import md5
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .constants import (
+    BULK_BATCH_SIZE,
+    COUNT_CACHE_TIMEOUT,
+    FANOUT_FOLLOWER_LIMIT,
+    INBOX_BACKFILL,
+    POPULAR_KEY,
+)
+from .models import InboxEntry, Post, Subscription
+from .query_utils import base_post_queryset
+
+
+def popular_sources(field, pks):
+    """Get authors or categories among pks with too many followers
+    to write their posts into every inbox, followers read them
+    on demand. Flags are cached, so fan-out and feed reads agree.
+    """
+    keys = {POPULAR_KEY.format(field=field, pk=pk): pk for pk in pks}
+    flags = cache.get_many(keys)
+    missing = {}
+    for key, pk in keys.items():
+        if key in flags:
+            continue
+        followers = Subscription.objects.filter(**{f'{field}_id': pk})
+        limited = followers.order_by().values('pk')
+        missing[key] = (
+            limited[:FANOUT_FOLLOWER_LIMIT + 1].count()
+            > FANOUT_FOLLOWER_LIMIT
+        )
+    if missing:
+        cache.set_many(missing, COUNT_CACHE_TIMEOUT)
+        flags.update(missing)
+    return {keys[key] for key, popular in flags.items() if popular}
+
+
+def is_popular(field, pk):
+    """Check if author or category is too popular for fan-out"""
+    return pk in popular_sources(field, [pk])
+
+
+def deliver_posts(post_ids):
+    """Write published posts into inboxes of their followers by batches.
+    Visibility of category and publication time are checked on read.
+    """
+    followed = Subscription.objects.filter(subscriber=OuterRef('user'))
+    InboxEntry.objects.filter(post_id__in=post_ids).filter(
+        Q(post__is_published=False)
+        | ~Exists(followed.filter(author=OuterRef('post__author')))
+        & ~Exists(followed.filter(category=OuterRef('post__category')))
+    ).delete()
+    by_author, by_category = defaultdict(list), defaultdict(list)
+    posts = Post.objects.filter(
+        pk__in=post_ids, is_published=True
+    ).values_list('pk', 'pub_date', 'author_id', 'category_id')
+    for pk, pub_date, author_id, category_id in posts:
+        by_author[author_id].append((pk, pub_date))
+        if category_id is not None:
+            by_category[category_id].append((pk, pub_date))
+    if not by_author:
+        return
+    subscriptions = Subscription.objects.filter(
+        Q(author__in=set(by_author) - popular_sources('author', by_author))
+        | Q(category__in=(
+            set(by_category) - popular_sources('category', by_category)
+        ))
+    ).values_list('subscriber_id', 'author_id', 'category_id')
+    entries = (
+        InboxEntry(user_id=subscriber_id, post_id=pk, pub_date=pub_date)
+        for subscriber_id, author_id, category_id in subscriptions.iterator()
+        for pk, pub_date in (
+            by_author.get(author_id, []) + by_category.get(category_id, [])
+        )
+    )
+    while batch := list(islice(entries, BULK_BATCH_SIZE)):
+        unique = {(entry.user_id, entry.post_id): entry for entry in batch}
+        InboxEntry.objects.bulk_create(
+            unique.values(),
+            update_conflicts=True,
+            unique_fields=('user', 'post'),
+            update_fields=('pub_date',),
+        )
+
+
+def follow(user, author=None, category=None):
+    """Subscribe user and copy latest posts of the source to the inbox"""
+    subscription, created = Subscription.objects.get_or_create(
+        subscriber=user, author=author, category=category
+    )
+    field, source = ('author', author) if author else ('category', category)
+    if not created or is_popular(field, source.pk):
+        return subscription
+    posts = base_post_queryset(
+        manager=source.posts
+    ).values_list('pk', 'pub_date')[:INBOX_BACKFILL]
+    InboxEntry.objects.bulk_create(
+        [
+            InboxEntry(user=user, post_id=pk, pub_date=pub_date)
+            for pk, pub_date in posts
+        ],
+        ignore_conflicts=True,
+    )
+    return subscription
+
+
+def unfollow(user, author=None, category=None):
+    """Unsubscribe user and drop inbox posts no other follow brings"""
+    Subscription.objects.filter(
+        subscriber=user, author=author, category=category
+    ).delete()
+    followed = user.subscriptions.all()
+    entries = user.inbox.exclude(
+        post__author__in=followed.filter(
+            author__isnull=False
+        ).values('author')
+    ).exclude(
+        post__category__in=followed.filter(
+            category__isnull=False
+        ).values('category')
+    )
+    if author is not None:
+        entries = entries.filter(post__author=author)
+    else:
+        entries = entries.filter(post__category=category)
+    entries.delete()
+
+
+def is_following(user, author=None, category=None):
+    """Check if requesting user follows the author or the category"""
+    if not user.is_authenticated:
+        return False
+    return Subscription.objects.filter(
+        subscriber=user, author=author, category=category
+    ).exists()
+
+
+class SubscriptionFeed:
+    """Visible posts of the user inbox and of followed popular authors
+    and categories, which are not written into inboxes, newest first.
+    The inbox is read by its (user, pub_date) index up to the end
+    of the requested page, only posts of the page are loaded.
+    Sources digest followed authors and categories of the user.
+    """
+
+    def __init__(self, user):
+        followed = sorted(
+            user.subscriptions.values_list('author_id', 'category_id'),
+            key=str,
+        )
+        self.sources = md5(str(followed).encode()).hexdigest()
+        authors = popular_sources(
+            'author', {author for author, _ in followed if author}
+        )
+        categories = popular_sources(
+            'category', {category for _, category in followed if category}
+        )
+        popular = Q(author__in=authors) | Q(category__in=categories)
+        self.inbox = InboxEntry.objects.filter(
+            user=user,
+            pub_date__lte=timezone.now(),
+            post__is_published=True,
+            post__category__is_published=True,
+        ).exclude(
+            Q(post__author__in=authors) | Q(post__category__in=categories)
+        ).order_by('-pub_date')
+        self.popular = base_post_queryset().filter(popular)
+
+    def count(self, limit=None):
+        """Count posts of the feed, with a limit each part is counted
+        up to limit + 1 posts
+        """
+        parts = (self.inbox, self.popular)
+        if limit is None:
+            return sum(part.count() for part in parts)
+        return sum(
+            part.order_by().values('pk')[:limit + 1].count()
+            for part in parts
+        )
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not isinstance(page, slice):
+            return self[page:page + 1][0]
+        stop = page.stop
+        newest = merge(
+            self.inbox.values_list('post_id', 'pub_date')[:stop],
+            self.popular.values_list('pk', 'pub_date')[:stop],
+            key=itemgetter(1),
+            reverse=True,
+        )
+        pks = [pk for pk, _ in islice(newest, page.start, stop)]
+        posts = base_post_queryset(posted=False, comment=True).in_bulk(pks)
+        return [posts[pk] for pk in pks if pk in posts]
+
+
+def subscription_feed(user):
+    """Get posts of the user inbox and posts of followed popular
+    authors and categories
+    """
+    return SubscriptionFeed(user)
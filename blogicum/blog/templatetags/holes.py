@@ -0,0 +1,111 @@
+import json
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import md5
+
+from django import template
+from django.conf import settings
+from django.utils.safestring import mark_safe
+
+from blog.cache_utils import single_flight
+from blog.constants import PAGE_CACHE_KEY
+
+register = template.Library()
+
+HOLE = re.compile(r'<!--hole:([\w=-]+)-->')
+
+HOLES = {}
+
+
+def nest(values):
+    """Turn pairs of dotted paths and values back into variables"""
+    variables = {}
+    for path, value in values:
+        *parents, name = path.split('.')
+        target = variables
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+    return variables
+
+
+def fill_holes(context, shared):
+    """Render per-user parts into holes of the shared page"""
+    def fill(match):
+        name, values = json.loads(urlsafe_b64decode(match[1]))
+        if name not in HOLES:
+            context.template.engine.get_template(name.rsplit(':', 1)[0])
+        with context.push(**nest(values)):
+            return HOLES[name].nodelist.render(context)
+    return mark_safe(HOLE.sub(fill, shared))
+
+
+class HoleNode(template.Node):
+
+    def __init__(self, name, variables, nodelist):
+        self.name = name
+        self.variables = variables
+        self.nodelist = nodelist
+
+    def render(self, context):
+        if not context.get('punch_holes'):
+            return self.nodelist.render(context)
+        values = [
+            (variable.token, variable.resolve(context))
+            for variable in self.variables
+        ]
+        data = json.dumps([self.name, values]).encode()
+        return f'<!--hole:{urlsafe_b64encode(data).decode()}-->'
+
+
+@register.tag
+def hole(parser, token):
+    """Render per-user part of a shared page on every request.
+    Page context is available in it, loop variables it uses
+    must be listed: {% hole comment.id comment.author_id %}
+    """
+    variables = [
+        parser.compile_filter(bit) for bit in token.split_contents()[1:]
+    ]
+    nodelist = parser.parse(('endhole',))
+    parser.delete_first_token()
+    template_name = parser.origin.template_name if parser.origin else None
+    node = HoleNode(f'{template_name}:{token.lineno}', variables, nodelist)
+    HOLES[node.name] = node
+    return node
+
+
+class SharedPageNode(template.Node):
+
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        version = context.get('page_cache_version')
+        if version is None:
+            return self.nodelist.render(context)
+        key = PAGE_CACHE_KEY.format(
+            page=md5(context['page_cache_key'].encode()).hexdigest()
+        )
+
+        def build():
+            with context.push(punch_holes=True):
+                return self.nodelist.render(context)
+
+        shared, stale = single_flight(
+            key, version, build, settings.PAGE_CACHE_TIMEOUT
+        )
+        if stale:
+            context['request'].served_stale = True
+        return fill_holes(context, shared)
+
+
+@register.tag
+def shared_page(parser, token):
+    """Cache the page for all users by page_cache_key of context,
+    per-user parts are left as holes with {% hole %}.
+    While one request renders a new version, others get the old one.
+    """
+    nodelist = parser.parse(('endshared_page',))
+    parser.delete_first_token()
+    return SharedPageNode(nodelist)
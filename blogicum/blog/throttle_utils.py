@@ -0,0 +1,73 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .constants import (
+    RATE_LIMIT_KEY,
+    RATE_LIMIT_LOCK_ATTEMPTS,
+    RATE_LIMIT_LOCK_KEY,
+    RATE_LIMIT_LOCK_POLL,
+    RATE_LIMIT_LOCK_TIMEOUT,
+)
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """Parse rate like '10/m' into bucket capacity and refill period"""
+    count, period = rate.split('/')
+    return int(count), RATE_PERIODS[period[0]]
+
+
+def client_key(request):
+    """Tell clients apart by user, anonymous ones by address"""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def acquire(counters, lock):
+    """Take the lock with an atomic add, retrying briefly while
+    another request of the client holds it
+    """
+    for _ in range(RATE_LIMIT_LOCK_ATTEMPTS):
+        if counters.add(lock, True, RATE_LIMIT_LOCK_TIMEOUT):
+            return True
+        time.sleep(RATE_LIMIT_LOCK_POLL)
+    return False
+
+
+def take_token(scope, client, now=None):
+    """Take a token from the bucket of the client.
+    Return seconds to wait for the next token if the bucket is empty
+    or 0 if the request may proceed. The bucket is changed under a lock,
+    so concurrent requests of a client cannot take the same token.
+    A lock not released in time is ignored, contention is not
+    reported as rate limiting.
+    """
+    rate = settings.RATE_LIMITS.get(scope)
+    if rate is None:
+        return 0
+    capacity, period = parse_rate(rate)
+    refill = capacity / period
+    counters = caches[settings.RATE_LIMIT_CACHE]
+    key = RATE_LIMIT_KEY.format(scope=scope, client=client)
+    lock = RATE_LIMIT_LOCK_KEY.format(key=key)
+    locked = acquire(counters, lock)
+    try:
+        now = time.time() if now is None else now
+        tokens, taken_at = counters.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - taken_at) * refill)
+        if tokens < 1:
+            return (1 - tokens) / refill
+        counters.set(key, (tokens - 1, now), timeout=period)
+        return 0
+    finally:
+        if locked:
+            counters.delete(lock)
+
+
+def retry_after(wait):
+    return str(math.ceil(wait))
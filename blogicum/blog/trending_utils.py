@@ -0,0 +1,104 @@
+import math
+
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from .cache_utils import touch_scopes
+from .constants import (
+    TRENDING_COMMENT_WEIGHT,
+    TRENDING_EPOCH,
+    TRENDING_HALF_LIFE,
+    TRENDING_MIN_WEIGHT,
+    TRENDING_SCOPE,
+    TRENDING_VIEW_WEIGHT,
+)
+from .home_feed_utils import visible_home_feed
+from .models import Post, PostActivity, TrendingScore
+from .query_utils import iter_pk_batches
+
+
+def growth(moment):
+    """Logarithm of growth of activity weight since the epoch"""
+    return (moment - TRENDING_EPOCH) / TRENDING_HALF_LIFE * math.log(2)
+
+
+def add_scores(score, other):
+    """Add scores kept as logarithms"""
+    if score is None:
+        return other
+    high, low = max(score, other), min(score, other)
+    return high + math.log1p(math.exp(low - high))
+
+
+def add_activity(views=None, comments=None):
+    """Log activity of posts given as mappings of post ids to counts"""
+    views, comments = views or {}, comments or {}
+    PostActivity.objects.bulk_create([
+        PostActivity(
+            post_id=pk, views=views.get(pk, 0), comments=comments.get(pk, 0)
+        )
+        for pk in {*views, *comments}
+    ])
+
+
+def consume_activity(batch):
+    """Add logged activity of a batch to scores of the posts,
+    return the number of posts scored for the first time
+    """
+    activity = PostActivity.objects.filter(pk__in=batch).values(
+        'post_id'
+    ).annotate(
+        views=Sum('views'), comments=Sum('comments'), at=Max('created_at')
+    ).order_by()
+    activity = {row['post_id']: row for row in activity}
+    existing = set(
+        Post.objects.filter(pk__in=activity).values_list('pk', flat=True)
+    )
+    scores = dict(
+        TrendingScore.objects.filter(post__in=existing).values_list(
+            'post', 'score'
+        )
+    )
+    rows = []
+    for pk in existing:
+        row = activity[pk]
+        weight = (
+            row['views'] * TRENDING_VIEW_WEIGHT
+            + row['comments'] * TRENDING_COMMENT_WEIGHT
+        )
+        if weight > 0:
+            score = math.log(weight) + growth(row['at'])
+            rows.append(TrendingScore(
+                post_id=pk, score=add_scores(scores.get(pk), score)
+            ))
+    TrendingScore.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=('post',),
+        update_fields=('score', 'updated_at'),
+    )
+    PostActivity.objects.filter(pk__in=batch).delete()
+    return len({row.post_id for row in rows} - set(scores))
+
+
+def update_trending(now=None):
+    """Consume activity logged since the last run by batches
+    and drop scores decayed below TRENDING_MIN_WEIGHT.
+    Posts entering or leaving the ranking touch TRENDING_SCOPE.
+    """
+    changed = 0
+    for batch in iter_pk_batches(PostActivity.objects.all()):
+        with transaction.atomic():
+            changed += consume_activity(batch)
+    floor = math.log(TRENDING_MIN_WEIGHT) + growth(now or timezone.now())
+    changed += TrendingScore.objects.filter(score__lt=floor).delete()[0]
+    if changed:
+        touch_scopes(TRENDING_SCOPE)
+
+
+def trending_home_feed():
+    """Visible home feed rows of posts with a score, most popular first"""
+    return visible_home_feed().filter(
+        post__trending__isnull=False
+    ).order_by('-post__trending__score')
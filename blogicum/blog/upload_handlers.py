@@ -0,0 +1,98 @@
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    StopUpload,
+    TemporaryFileUploadHandler,
+)
+from django.http import QueryDict
+from django.template.defaultfilters import filesizeformat
+from django.utils.datastructures import MultiValueDict
+
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',
+    b'\x89PNG\r\n\x1a\n',
+    b'GIF87a',
+    b'GIF89a',
+)
+
+
+def is_image_header(data):
+    """Check first bytes of the file for a known image format"""
+    return data.startswith(IMAGE_SIGNATURES) or (
+        data[:4] == b'RIFF' and data[8:12] == b'WEBP'
+    )
+
+
+class RejectedUpload(UploadedFile):
+    """Empty file standing for a rejected upload,
+    the form field reports the reason
+    """
+
+    def __init__(self, name, reason):
+        super().__init__(BytesIO(), name, size=0)
+        self.rejection = reason
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file by chunks. Only images
+    are uploaded to the site, a file which is not an image by its
+    first bytes or exceeds IMAGE_UPLOAD_MAX_SIZE stops the upload,
+    the rest of the body is not read. A body longer than any allowed
+    upload is not read at all.
+    """
+
+    rejection = None
+
+    def handle_raw_input(self, input_data, META, content_length,  # noqa: N803
+                         boundary, encoding=None):
+        fields_limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if fields_limit is None:
+            return None
+        if content_length > settings.IMAGE_UPLOAD_MAX_SIZE + fields_limit:
+            self.rejection = self.too_large_message()
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type,
+                 content_length, *args, **kwargs):
+        super().new_file(
+            field_name, file_name, content_type, content_length,
+            *args, **kwargs
+        )
+        if content_length and content_length > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject(self.too_large_message())
+
+    def reject(self, reason):
+        self.rejection = reason
+        raise StopUpload(connection_reset=True)
+
+    def too_large_message(self):
+        limit = filesizeformat(settings.IMAGE_UPLOAD_MAX_SIZE)
+        return f'Размер файла не должен превышать {limit}.'
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and not is_image_header(raw_data):
+            self.reject('Загрузите изображение в формате JPEG, PNG, GIF '
+                        'или WebP.')
+        if start + len(raw_data) > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject(self.too_large_message())
+        self.file.write(raw_data)
+        return None
+
+
+def read_image_uploads(request):
+    """Parse the body of the request with ImageUploadHandler instead
+    of the default handlers. A rejected file is put into request.FILES
+    as RejectedUpload, the form field reports the reason.
+    Return the handler.
+    """
+    handler = ImageUploadHandler(request)
+    request.upload_handlers = [handler]
+    files = request.FILES
+    if handler.rejection is not None and handler.file_name is not None:
+        files[handler.field_name] = RejectedUpload(
+            handler.file_name, handler.rejection
+        )
+    return handler
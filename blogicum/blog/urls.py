@@ -1,6 +1,6 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
@@ -42,19 +42,98 @@ post_urls = [
     ),
 ]
 
+feed_urls = [
+    path('rss/', feeds.LatestPostsFeed(), name='feed_rss'),
+    path('atom/', feeds.LatestPostsAtomFeed(), name='feed_atom'),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.CategoryPostsAtomFeed(),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.ProfilePostsFeed(),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.ProfilePostsAtomFeed(),
+        name='profile_feed_atom'
+    ),
+]
+
+api_urls = [
+    path('posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path(
+        'posts/<int:post_id>/',
+        api.PostDetailApiView.as_view(),
+        name='api_post'
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        api.CommentListApiView.as_view(),
+        name='api_comments'
+    ),
+    path(
+        'categories/',
+        api.CategoryListApiView.as_view(),
+        name='api_categories'
+    ),
+    path(
+        'profiles/<str:username>/',
+        api.ProfileApiView.as_view(),
+        name='api_profile'
+    ),
+]
+
 urlpatterns = [
     path('', views.HomePageView.as_view(), name='index'),
+    path('popular/', views.PopularListView.as_view(), name='popular'),
+    path('archive/', views.ArchiveView.as_view(), name='archive'),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.ArchiveMonthView.as_view(),
+        name='archive_month'
+    ),
     path(
         'auth/registration/',
         views.ProfileCreateView.as_view(),
         name='registration'
     ),
     path('posts/', include(post_urls)),
+    path('feeds/', include(feed_urls)),
+    path('api/v1/', include(api_urls)),
+    path('sitemap.xml', views.sitemap, name='sitemap'),
+    re_path(
+        r'^sitemaps/(?P<path>[\w-]+\.xml\.gz)$',
+        views.sitemap,
+        name='sitemap_shard'
+    ),
+    path(
+        'subscriptions/',
+        views.SubscriptionFeedView.as_view(),
+        name='subscriptions'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/follow/',
+        views.FollowCategoryView.as_view(),
+        name='follow_category'
+    ),
+    path(
+        'category/<slug:category_slug>/unfollow/',
+        views.FollowCategoryView.as_view(subscribe=False),
+        name='unfollow_category'
+    ),
     path(
         'profile/edit/',
         views.ProfileUpdateView.as_view(),
@@ -65,4 +144,14 @@ urlpatterns = [
         views.ProfileListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/follow/',
+        views.FollowAuthorView.as_view(),
+        name='follow_author'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.FollowAuthorView.as_view(subscribe=False),
+        name='unfollow_author'
+    ),
 ]
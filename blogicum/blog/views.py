@@ -1,43 +1,194 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.db.models import Max
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils.functional import cached_property
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
     UpdateView,
+    View,
 )
+from django.views.static import serve
 
-from blogicum.settings import PAGE_LIMIT
+from .archive_utils import (
+    archive_months,
+    month_last_modified,
+    month_range,
+)
+from .bulk_actions import bulk_delete_posts, delete_or_queue
+from .cache_utils import (
+    category_scope,
+    post_scope,
+    profile_scope,
+    scope_touched_at,
+)
+from .constants import (
+    INDEX_SCOPE,
+    SITE_SCOPE,
+    SITEMAP_INDEX_NAME,
+    TRENDING_SCOPE,
+)
+from .counter_utils import view_counter
 from .forms import ProfileForm, PostForm, CommentForm
-from .mixins import OnlyAuthorMixin, ChangeCommentMixin
-from .models import Category, Post, Comment
-from .query_utils import base_post_queryset
+from .home_feed_utils import home_feed_last_modified, visible_home_feed
+from .mixins import (
+    CachedCountPaginationMixin,
+    ChangeCommentMixin,
+    ConditionalGetMixin,
+    ImageUploadMixin,
+    OnlyAuthorMixin,
+    RateLimitMixin,
+)
+from .models import ArchiveMonth, Category, Post, Comment, HomeFeedRow
+from .paginators import HomeFeedPaginator, SubscriptionFeedPaginator
+from .query_utils import (
+    after_cursor,
+    base_post_queryset,
+    encode_cursor,
+    latest,
+    posts_last_modified,
+)
+from .subscription_utils import (
+    follow,
+    is_following,
+    subscription_feed,
+    unfollow,
+)
+from .trending_utils import trending_home_feed
 
 User = get_user_model()
 
 
-class HomePageView(ListView):
+class HomePageView(
+    ConditionalGetMixin, CachedCountPaginationMixin, ListView
+):
     """Display home page with paginated posts"""
 
     model = Post
     template_name = 'blog/index.html'
-    paginate_by = PAGE_LIMIT
+    paginate_by = settings.PAGE_LIMIT
+    paginator_class = HomeFeedPaginator
+
+    def get_queryset(self):
+        """Get eligible for show posts from the home feed table"""
+        return visible_home_feed()
+
+    def get_count_scope(self):
+        return INDEX_SCOPE
+
+    def get_last_modified(self):
+        return latest(
+            home_feed_last_modified(),
+            scope_touched_at(INDEX_SCOPE),
+        )
+
+
+class PopularListView(CachedCountPaginationMixin, ListView):
+    """Display posts ranked by recent views and comments"""
+
+    model = Post
+    template_name = 'blog/popular.html'
+    paginate_by = settings.PAGE_LIMIT
+    paginator_class = HomeFeedPaginator
+
+    def get_queryset(self):
+        """Get ranked posts from the home feed table"""
+        return trending_home_feed()
+
+    def get_count_scope(self):
+        return INDEX_SCOPE
+
+    def get_count_variant(self):
+        """Ranked posts change without touching the index"""
+        touched = scope_touched_at(TRENDING_SCOPE)
+        return f'popular:{touched.isoformat() if touched else ""}'
+
+
+class ArchiveView(ConditionalGetMixin, ListView):
+    """Display months with published posts"""
+
+    template_name = 'blog/archive.html'
+    context_object_name = 'archive_months'
+
+    def get_queryset(self):
+        return archive_months()
+
+    def get_last_modified(self):
+        return latest(
+            ArchiveMonth.objects.aggregate(Max('updated_at'))[
+                'updated_at__max'
+            ],
+            scope_touched_at(SITE_SCOPE),
+        )
+
+
+class ArchiveMonthView(ConditionalGetMixin, ListView):
+    """Display posts of the month by keyset pages, a page is chosen
+    by the cursor of the last post of the previous one
+    """
+
+    template_name = 'blog/archive_month.html'
+    ordering = ('-pub_date', '-post')
+
+    def get_archive_month(self):
+        if not hasattr(self, '_archive_month'):
+            self._archive_month = get_object_or_404(
+                archive_months(),
+                year=self.kwargs['year'],
+                month=self.kwargs['month'],
+            )
+        return self._archive_month
 
     def get_queryset(self):
-        """Get eligible for show posts"""
-        return base_post_queryset(comment=True)
+        archive_month = self.get_archive_month()
+        start, end = month_range(archive_month.year, archive_month.month)
+        queryset = visible_home_feed().filter(
+            pub_date__gte=start, pub_date__lt=end
+        ).order_by(*self.ordering)
+        cursor = self.request.GET.get('cursor')
+        if cursor:
+            try:
+                after = after_cursor(HomeFeedRow, self.ordering, cursor)
+            except ValueError as error:
+                raise Http404(error)
+            queryset = queryset.filter(after)
+        return queryset
+
+    def get_last_modified(self):
+        return latest(
+            month_last_modified(self.get_archive_month()),
+            scope_touched_at(SITE_SCOPE),
+        )
+
+    def get_context_data(self, **kwargs):
+        rows = list(self.object_list[:settings.PAGE_LIMIT + 1])
+        next_cursor = None
+        if len(rows) > settings.PAGE_LIMIT:
+            rows = rows[:settings.PAGE_LIMIT]
+            next_cursor = encode_cursor((rows[-1].pub_date, rows[-1].pk))
+        context = super().get_context_data(
+            object_list=[row.as_post() for row in rows], **kwargs
+        )
+        context['archive_month'] = self.get_archive_month()
+        context['next_cursor'] = next_cursor
+        return context
 
 
-class CategoryListView(ListView):
+class CategoryListView(
+    ConditionalGetMixin, CachedCountPaginationMixin, ListView
+):
     """Display posts in chosen category"""
 
     model = Post
     template_name = 'blog/category.html'
-    paginate_by = PAGE_LIMIT
+    paginate_by = settings.PAGE_LIMIT
 
     def get_category(self):
         """Get category if published, if not get 404"""
@@ -55,17 +206,38 @@ class CategoryListView(ListView):
         )
         return queryset
 
+    def get_count_scope(self):
+        return category_scope(self.kwargs['category_slug'])
+
     def get_context_data(self, **kwargs):
         context = super(CategoryListView, self).get_context_data(**kwargs)
         context['category'] = self.get_category()
+        context['is_following'] = self.following
         return context
 
+    @cached_property
+    def following(self):
+        return is_following(self.request.user, category=self.get_category())
+
+    def get_etag_variant(self):
+        return str(self.following)
+
+    def get_last_modified(self):
+        category = self.get_category()
+        return latest(
+            posts_last_modified(base_post_queryset(manager=category.posts)),
+            category.updated_at,
+            scope_touched_at(category_scope(category.slug)),
+        )
+
 
-class ProfileListView(ListView):
+class ProfileListView(
+    ConditionalGetMixin, CachedCountPaginationMixin, ListView
+):
     """Display posts in chosen profile and profile information"""
 
     template_name = 'blog/profile.html'
-    paginate_by = PAGE_LIMIT
+    paginate_by = settings.PAGE_LIMIT
 
     def get_user(self):
         return get_object_or_404(User, username=self.kwargs['username'])
@@ -82,13 +254,94 @@ class ProfileListView(ListView):
         )
         return queryset
 
+    def get_count_scope(self):
+        return profile_scope(self.kwargs['username'])
+
+    def get_count_variant(self):
+        """Owner sees unpublished posts too, count them separately"""
+        if self.request.user.get_username() == self.kwargs['username']:
+            return 'own'
+        return ''
+
+    def get_page_variant(self):
+        return self.get_count_variant()
+
     def get_context_data(self, **kwargs):
         """Add profile data to context"""
         user = self.get_user()
         context = super(ProfileListView, self).get_context_data(**kwargs)
         context['profile'] = user
+        context['is_following'] = self.following
         return context
 
+    @cached_property
+    def following(self):
+        return is_following(self.request.user, author=self.get_user())
+
+    def get_etag_variant(self):
+        return str(self.following)
+
+    def get_last_modified(self):
+        user = self.get_user()
+        queryset = base_post_queryset(
+            manager=user.posts,
+            posted=self.request.user != user,
+        )
+        return latest(
+            posts_last_modified(queryset),
+            scope_touched_at(profile_scope(user.username)),
+        )
+
+
+class SubscriptionFeedView(
+    LoginRequiredMixin, CachedCountPaginationMixin, ListView
+):
+    """Display posts of followed authors and categories"""
+
+    template_name = 'blog/subscriptions.html'
+    paginate_by = settings.PAGE_LIMIT
+    paginator_class = SubscriptionFeedPaginator
+
+    def get_queryset(self):
+        return subscription_feed(self.request.user)
+
+    def get_count_scope(self):
+        return INDEX_SCOPE
+
+    def get_count_variant(self):
+        """Count is renewed when the user follows or unfollows"""
+        user_id = self.request.user.pk
+        return f'subscriptions:{user_id}:{self.object_list.sources}'
+
+
+class FollowAuthorView(LoginRequiredMixin, View):
+    """Follow or unfollow author of the profile"""
+
+    http_method_names = ['post']
+    subscribe = True
+
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        if author != request.user:
+            change = follow if self.subscribe else unfollow
+            change(request.user, author=author)
+        return redirect('blog:profile', username=username)
+
+
+class FollowCategoryView(LoginRequiredMixin, View):
+    """Follow or unfollow published category"""
+
+    http_method_names = ['post']
+    subscribe = True
+
+    def post(self, request, category_slug):
+        category = get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+        change = follow if self.subscribe else unfollow
+        change(request.user, category=category)
+        return redirect('blog:category_posts', category_slug=category_slug)
+
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     """Edit user profile"""
@@ -108,13 +361,20 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, DetailView):
     """Display post details and comments"""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def dispatch(self, request, *args, **kwargs):
+        """Count views of visible post, answered by 304 too"""
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            view_counter.record(self.kwargs['post_id'])
+        return response
+
     def get_context_data(self, **kwargs):
         """Get post details, comments and comment form"""
         self.object = self.get_object()
@@ -133,10 +393,23 @@ class PostDetailView(DetailView):
             )
         return post
 
+    def get_last_modified(self):
+        post = self.get_object()
+        commented = post.comments.aggregate(Max('created_at'))
+        return latest(
+            post.updated_at,
+            post.pub_date,
+            commented['created_at__max'],
+            scope_touched_at(post_scope(post.pk)),
+        )
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+
+class PostCreateView(
+    LoginRequiredMixin, RateLimitMixin, ImageUploadMixin, CreateView
+):
     """Create a new post"""
 
+    rate_limit_scope = 'post'
     form_class = PostForm
     template_name = 'blog/create.html'
 
@@ -151,7 +424,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return reverse('blog:profile', kwargs={'username': user.username})
 
 
-class PostUpdateView(OnlyAuthorMixin, UpdateView):
+class PostUpdateView(OnlyAuthorMixin, ImageUploadMixin, UpdateView):
     """Edit an existing post"""
 
     model = Post
@@ -175,10 +448,20 @@ class PostDeleteView(OnlyAuthorMixin, DeleteView):
     pk_url_kwarg = 'post_id'
     success_url = reverse_lazy('blog:index')
 
+    def form_valid(self, form):
+        """Delete with set-based queries, a post with many comments
+        is hidden at once and deleted in the background
+        """
+        delete_or_queue(
+            bulk_delete_posts, Post.objects.filter(pk=self.object.pk)
+        )
+        return redirect(self.get_success_url())
+
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
     """Create a new comment on a post"""
 
+    rate_limit_scope = 'comment'
     post_obj = None
     model = Comment
     form_class = CommentForm
@@ -208,10 +491,18 @@ class CommentDeleteView(OnlyAuthorMixin, ChangeCommentMixin, DeleteView):
     """Delete comment on a post"""
 
 
-class ProfileCreateView(CreateView):
+class ProfileCreateView(RateLimitMixin, CreateView):
+    rate_limit_scope = 'registration'
     template_name = 'registration/registration_form.html'
     form_class = UserCreationForm
 
     def get_success_url(self):
         """On success redirect to profile page"""
         return reverse('blog:index')
+
+
+def sitemap(request, path=SITEMAP_INDEX_NAME):
+    """Serve generated sitemap files for simple deployments,
+    a web server should serve SITEMAP_ROOT in production
+    """
+    return serve(request, path, document_root=settings.SITEMAP_ROOT)
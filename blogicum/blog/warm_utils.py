@@ -0,0 +1,144 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from math import ceil
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections, transaction
+from django.db.models import Count
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import resolve, reverse
+
+from .cache_utils import is_shared_cache
+from .home_feed_utils import visible_home_feed
+from .models import Category
+from .query_utils import base_post_queryset
+
+logger = logging.getLogger('blogicum.warm_cache')
+
+_scheduled = None
+_schedule_lock = threading.Lock()
+
+
+def page_count(posts):
+    return max(1, ceil(posts / settings.PAGE_LIMIT))
+
+
+def paged_urls(path, pages):
+    return [
+        path if number == 1 else f'{path}?page={number}'
+        for number in range(1, pages + 1)
+    ]
+
+
+def hot_post_ids(limit):
+    """Most read visible posts"""
+    return base_post_queryset().order_by(
+        '-view_count'
+    ).values_list('pk', flat=True)[:limit]
+
+
+def hot_urls(pages, posts):
+    """Get first pages of the index and of every published category
+    and pages of hot posts, pages past the last one are skipped
+    """
+    counts = dict(
+        visible_home_feed().order_by().values_list(
+            'category_slug'
+        ).annotate(Count('pk'))
+    )
+    urls = paged_urls(
+        reverse('blog:index'), min(pages, page_count(sum(counts.values())))
+    )
+    slugs = Category.objects.filter(is_published=True).values_list(
+        'slug', flat=True
+    )
+    for slug in slugs:
+        urls += paged_urls(
+            reverse('blog:category_posts', args=[slug]),
+            min(pages, page_count(counts.get(slug, 0))),
+        )
+    urls += [
+        reverse('blog:post_detail', args=[pk]) for pk in hot_post_ids(posts)
+    ]
+    return urls
+
+
+def render_page(url, host):
+    """Render the page through its view as an anonymous reader,
+    the middleware is skipped. Return url and status code.
+    """
+    path, _, query = url.partition('?')
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.GET = QueryDict(query)
+    request.META = {
+        'HTTP_HOST': host,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+    }
+    request.user = AnonymousUser()
+    try:
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except Http404:
+        return url, 404
+    return url, response.status_code
+
+
+def render_in_thread(url, host):
+    try:
+        return render_page(url, host)
+    finally:
+        connections.close_all()
+
+
+def warm_urls(urls, workers, host):
+    """Render pages as an anonymous reader to fill caches.
+    One worker renders them in the calling thread.
+    """
+    if workers <= 1:
+        return [render_page(url, host) for url in urls]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(render_in_thread, host=host), urls))
+
+
+def warm_hot_pages():
+    global _scheduled
+    with _schedule_lock:
+        _scheduled = None
+    urls = hot_urls(settings.WARM_CACHE_PAGES, settings.WARM_CACHE_POSTS)
+    results = warm_urls(
+        urls, settings.WARM_CACHE_WORKERS, settings.WARM_CACHE_HOST
+    )
+    logger.info('%s hot pages warmed', len(results))
+    connections.close_all()
+
+
+def schedule_warm_cache(delay=None):
+    """Warm hot pages in background after a delay, calls made
+    while warming is already scheduled are merged into it
+    """
+    global _scheduled
+    with _schedule_lock:
+        if _scheduled is not None:
+            return
+        _scheduled = threading.Timer(
+            settings.WARM_CACHE_DELAY if delay is None else delay,
+            warm_hot_pages,
+        )
+        _scheduled.daemon = True
+        _scheduled.start()
+
+
+def warm_after_changes():
+    """Schedule warming once changes invalidating many pages commit.
+    Pages are not warmed into a cache other workers don't see.
+    """
+    if settings.WARM_CACHE_AFTER_CHANGES and is_shared_cache():
+        transaction.on_commit(schedule_warm_cache)
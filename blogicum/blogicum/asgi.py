@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+from blogicum.settings import settings_module
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module())
 
 application = get_asgi_application()
+
+if settings.TEMPLATES_PREWARM:
+    from blogicum.template_tools import warm_templates
+    warm_templates()
@@ -0,0 +1,403 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from io import BytesIO
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+
+LOCAL_OBJECT_STORE = 'blogicum.media_storage.LocalObjectStore'
+
+
+class ContentAddressedStorageMixin:
+    """Store files under names made of their content hash, so equal
+    uploads share one file. Directory of the given name is kept:
+    post_images/photo.jpg becomes post_images/3f/3fa9…c2.jpg
+    """
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, hexdigest[:2], hexdigest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            self.keep(name)
+            return name
+        return super().save(name, content, max_length)
+
+    def keep(self, name):
+        """Mark existing file as just used, cleanup skips fresh files"""
+
+
+class ContentAddressedFileSystemStorage(
+    ContentAddressedStorageMixin, FileSystemStorage
+):
+
+    def keep(self, name):
+        os.utime(self.path(name))
+
+
+class ObjectStoreError(Exception):
+    """Error of the local object store, shaped like botocore ClientError"""
+
+    def __init__(self, code, operation):
+        super().__init__(f'{operation}: {code}')
+        self.response = {'Error': {'Code': code}}
+
+
+class LocalObjectStore:
+    """In-process stand-in for S3 client with the subset of boto3 S3
+    client methods ObjectStorage uses, argument names follow boto3.
+    Objects live in memory of the process, signed URLs are served
+    by serve_object().
+    """
+
+    exceptions = SimpleNamespace(ClientError=ObjectStoreError)
+
+    _buckets = defaultdict(dict)
+    _uploads = {}
+    _lock = threading.Lock()
+
+    def __init__(self, **options):
+        pass
+
+    def get_bucket(self, bucket):
+        return self._buckets[bucket]
+
+    def get_stored(self, bucket, key, operation):
+        try:
+            return self.get_bucket(bucket)[key]
+        except KeyError:
+            raise ObjectStoreError('404', operation)
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):  # noqa: N803
+        body = Body if isinstance(Body, bytes) else Body.read()
+        with self._lock:
+            self.get_bucket(Bucket)[Key] = {
+                'Body': body,
+                'ContentType': ContentType,
+                'LastModified': timezone.now(),
+            }
+        return {'ETag': hashlib.md5(body).hexdigest()}
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        stored = self.get_stored(Bucket, Key, 'HeadObject')
+        return {
+            'ContentLength': len(stored['Body']),
+            'ContentType': stored['ContentType'],
+            'LastModified': stored['LastModified'],
+        }
+
+    def get_object(self, Bucket, Key):  # noqa: N803
+        stored = self.get_stored(Bucket, Key, 'GetObject')
+        return {
+            **self.head_object(Bucket, Key),
+            'Body': BytesIO(stored['Body']),
+        }
+
+    def copy_object(self, Bucket, Key, CopySource,  # noqa: N803
+                    MetadataDirective='COPY', ContentType=None):  # noqa: N803
+        source = self.get_stored(
+            CopySource['Bucket'], CopySource['Key'], 'CopyObject'
+        )
+        if MetadataDirective == 'COPY':
+            ContentType = source['ContentType']
+        return self.put_object(Bucket, Key, source['Body'], ContentType)
+
+    def delete_object(self, Bucket, Key):  # noqa: N803
+        with self._lock:
+            self.get_bucket(Bucket).pop(Key, None)
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter='',  # noqa: N803
+                        ContinuationToken='', MaxKeys=1000):  # noqa: N803
+        contents, prefixes = [], set()
+        keys = sorted(
+            key for key in self.get_bucket(Bucket)
+            if key.startswith(Prefix) and key > ContinuationToken
+        )
+        for key in keys:
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                prefixes.add(Prefix + rest.split(Delimiter)[0] + Delimiter)
+            else:
+                contents.append({'Key': key})
+            if len(contents) == MaxKeys:
+                break
+        truncated = len(contents) == MaxKeys and key != keys[-1]
+        page = {
+            'Contents': contents,
+            'CommonPrefixes': [{'Prefix': prefix} for prefix in prefixes],
+            'IsTruncated': truncated,
+        }
+        if truncated:
+            page['NextContinuationToken'] = key
+        return page
+
+    def create_multipart_upload(
+        self, Bucket, Key, ContentType=None  # noqa: N803
+    ):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+    def upload_part(
+        self, Bucket, Key, UploadId, PartNumber, Body  # noqa: N803
+    ):
+        with self._lock:
+            self._uploads[UploadId][PartNumber] = Body
+        return {'ETag': hashlib.md5(Body).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId,  # noqa: N803
+                                  MultipartUpload):  # noqa: N803
+        with self._lock:
+            parts = self._uploads.pop(UploadId)
+        body = b''.join(
+            parts[part['PartNumber']] for part in MultipartUpload['Parts']
+        )
+        return self.put_object(Bucket, Key, body)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):  # noqa: N803
+        with self._lock:
+            self._uploads.pop(UploadId, None)
+        return {}
+
+    def generate_presigned_url(
+        self, ClientMethod, Params, ExpiresIn  # noqa: N803
+    ):
+        expires = int(time.time()) + ExpiresIn
+        path = reverse(
+            'object_store',
+            kwargs={'bucket': Params['Bucket'], 'key': Params['Key']},
+        )
+        signature = object_signature(path, expires)
+        return f'{path}?Expires={expires}&Signature={signature}'
+
+
+def object_signature(path, expires):
+    return salted_hmac('object_store', f'{path}:{expires}').hexdigest()
+
+
+def serve_object(request, bucket, key):
+    """Serve object of the local store by a signed URL"""
+    try:
+        expires = int(request.GET['Expires'])
+    except (KeyError, ValueError):
+        raise PermissionDenied
+    if expires < time.time() or not constant_time_compare(
+        request.GET.get('Signature', ''),
+        object_signature(request.path, expires),
+    ):
+        raise PermissionDenied
+    client = LocalObjectStore()
+    try:
+        stored = client.get_object(Bucket=bucket, Key=key)
+    except ObjectStoreError:
+        raise Http404
+    return FileResponse(
+        stored['Body'],
+        content_type=stored['ContentType'] or 'application/octet-stream',
+    )
+
+
+class ObjectStorage(Storage):
+    """Storage keeping files in a bucket of S3-compatible object store.
+    'client' is a dotted path to a factory of boto3-like S3 client
+    called with 'client_options', e.g. boto3.client with
+    {'service_name': 's3', 'endpoint_url': …}. Files larger than
+    'part_size' are uploaded by parts in parallel, URLs are signed
+    and expire in 'url_expires' seconds.
+    """
+
+    def __init__(self, bucket, client=None, client_options=None,
+                 part_size=8 * 1024 * 1024, upload_workers=4,
+                 url_expires=60 * 60):
+        self.bucket = bucket
+        self.client = import_string(client or LOCAL_OBJECT_STORE)(
+            **(client_options or {})
+        )
+        self.part_size = part_size
+        self.upload_workers = upload_workers
+        self.url_expires = url_expires
+
+    def is_missing(self, error):
+        return error.response['Error']['Code'] in ('404', 'NoSuchKey')
+
+    def head(self, name):
+        return self.client.head_object(Bucket=self.bucket, Key=name)
+
+    def _open(self, name, mode='rb'):
+        try:
+            stored = self.client.get_object(Bucket=self.bucket, Key=name)
+        except self.client.exceptions.ClientError as error:
+            if self.is_missing(error):
+                raise FileNotFoundError(name) from error
+            raise
+        return ContentFile(stored['Body'].read(), name=name)
+
+    def _save(self, name, content):
+        content_type = mimetypes.guess_type(name)[0]
+        content.seek(0)
+        if content.size <= self.part_size:
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=name,
+                Body=content.read(),
+                ContentType=content_type,
+            )
+        else:
+            self.upload_parts(name, content, content_type)
+        return name
+
+    def upload_parts(self, name, content, content_type):
+        """Upload file by parts in parallel, keeping in memory
+        no more parts than twice the number of workers
+        """
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=name, ContentType=content_type
+        )['UploadId']
+        upload = partial(
+            self.client.upload_part,
+            Bucket=self.bucket,
+            Key=name,
+            UploadId=upload_id,
+        )
+        parts = []
+        try:
+            with ThreadPoolExecutor(self.upload_workers) as pool:
+                pending = {}
+                for number, body in enumerate(
+                    iter(partial(content.read, self.part_size), b''),
+                    start=1,
+                ):
+                    if len(pending) >= 2 * self.upload_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            parts.append(self.uploaded(pending, future))
+                    future = pool.submit(upload, PartNumber=number, Body=body)
+                    pending[future] = number
+                for future in list(pending):
+                    parts.append(self.uploaded(pending, future))
+        except BaseException:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=name, UploadId=upload_id
+            )
+            raise
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=name,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': sorted(
+                parts, key=lambda part: part['PartNumber']
+            )},
+        )
+
+    def uploaded(self, pending, future):
+        number = pending.pop(future)
+        return {'PartNumber': number, 'ETag': future.result()['ETag']}
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=name)
+
+    def exists(self, name):
+        try:
+            self.head(name)
+        except self.client.exceptions.ClientError as error:
+            if self.is_missing(error):
+                return False
+            raise
+        return True
+
+    def listdir(self, path):
+        prefix = f'{path.rstrip("/")}/' if path else ''
+        directories, files = [], []
+        options = {'Bucket': self.bucket, 'Prefix': prefix, 'Delimiter': '/'}
+        while True:
+            page = self.client.list_objects_v2(**options)
+            directories += [
+                entry['Prefix'][len(prefix):].rstrip('/')
+                for entry in page.get('CommonPrefixes', [])
+            ]
+            files += [
+                entry['Key'][len(prefix):]
+                for entry in page.get('Contents', [])
+            ]
+            if not page.get('IsTruncated'):
+                return directories, files
+            options['ContinuationToken'] = page['NextContinuationToken']
+
+    def size(self, name):
+        return self.head(name)['ContentLength']
+
+    def get_modified_time(self, name):
+        return self.head(name)['LastModified']
+
+    def url(self, name):
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': name},
+            ExpiresIn=self.url_expires,
+        )
+
+
+class ContentAddressedObjectStorage(
+    ContentAddressedStorageMixin, ObjectStorage
+):
+
+    def keep(self, name):
+        """Objects can't be touched, copying the object onto itself
+        refreshes LastModified the cleanup grace period is counted from
+        """
+        options = {}
+        content_type = mimetypes.guess_type(name)[0]
+        if content_type:
+            options['ContentType'] = content_type
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=name,
+            CopySource={'Bucket': self.bucket, 'Key': name},
+            MetadataDirective='REPLACE',
+            **options,
+        )
+
+
+def uses_local_object_store():
+    """Check if a storage of STORAGES keeps objects in LocalObjectStore,
+    only then the site serves signed URLs of the objects
+    """
+    for config in settings.STORAGES.values():
+        backend = import_string(config['BACKEND'])
+        client = config.get('OPTIONS', {}).get('client', LOCAL_OBJECT_STORE)
+        if issubclass(backend, ObjectStorage) and (
+            client == LOCAL_OBJECT_STORE
+        ):
+            return True
+    return False
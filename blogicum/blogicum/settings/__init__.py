@@ -0,0 +1,20 @@
+"""Settings profile is chosen by BLOGICUM_PROFILE environment variable:
+dev (default), test or prod. Other BLOGICUM_* variables tune them.
+Entry points pass the module of the profile to DJANGO_SETTINGS_MODULE,
+so importing one profile never runs another.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ('dev', 'test', 'prod')
+
+
+def settings_module():
+    """Get settings module of the profile chosen by BLOGICUM_PROFILE"""
+    profile = os.environ.get('BLOGICUM_PROFILE', 'dev')
+    if profile not in PROFILES:
+        raise ImproperlyConfigured(
+            f'Unknown settings profile {profile}, use dev, test or prod'
+        )
+    return f'blogicum.settings.{profile}'
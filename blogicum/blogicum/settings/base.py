@@ -0,0 +1,263 @@
+"""Settings shared by all profiles, the values DEBUG changes
+are set by the profiles
+"""
+import os
+from pathlib import Path
+
+
+def env(name, default=None):
+    return os.environ.get(f'BLOGICUM_{name}', default)
+
+
+def env_flag(name, default=False):
+    value = env(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=()):
+    value = env(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = env(
+    'SECRET_KEY',
+    'django-insecure-9ca9c!uy21*q+8%p)m5@*@0peleeg67fm7^75c5l0!*qvymlut'
+)
+
+DEBUG = False
+
+DEBUG_TOOLBAR = False
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', ['localhost', '127.0.0.1'])
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static_dev',
+]
+
+INSTALLED_APPS = [
+    'pages.apps.PagesConfig',
+    'blog.apps.BlogConfig',
+    'django_bootstrap5',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'blogicum.static_pipeline.StaticFilesMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blogicum.template_tools.TemplateProfilerMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+TEMPLATES_PREWARM = True
+
+TEMPLATE_PROFILING = False
+
+STARTUP_TIME_BUDGET = 1.5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+SITE_URL = env('SITE_URL', 'http://127.0.0.1:8000')
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'GMT'
+
+USE_I18N = True
+
+USE_TZ = True
+
+STATIC_URL = 'static_dev/'
+
+STATIC_ROOT = BASE_DIR / 'static'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'blogicum.media_storage.ContentAddressedFileSystemStorage',
+    },
+    'objects': {
+        'BACKEND': 'blogicum.media_storage.ContentAddressedObjectStorage',
+        'OPTIONS': {
+            'bucket': env('MEDIA_BUCKET', 'blogicum-media'),
+            'client': 'boto3.client',
+            'client_options': {
+                'service_name': 's3',
+                'endpoint_url': env('S3_ENDPOINT_URL'),
+            },
+        },
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'blogicum.static_pipeline.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
+STATIC_SERVE = False
+
+STATIC_MAX_AGE = 60 * 60
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Keep rate limit counters in a cache shared by all nodes,
+    # e.g. Redis or Memcached, when the site runs on several of them
+    'rate_limits': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'rate_limits',
+    },
+}
+
+RATE_LIMIT_CACHE = 'rate_limits'
+
+# Per-process caches like LocMem are trusted for invalidation only
+# when the site runs in a single process
+SINGLE_PROCESS = False
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['blog.auth_backends.CachedModelBackend']
+
+USER_CACHE_TIMEOUT = 5 * 60
+
+PAGE_CACHE_TIMEOUT = 10 * 60
+
+VIEW_FLUSH_INTERVAL = 10
+
+# Cached pages and counts are rebuilt by one worker at a time,
+# others get the stale copy kept for STALE_TIMEOUT after expiry
+STALE_TIMEOUT = 60 * 60
+
+SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+
+# Higher values refresh entries earlier before expiry, 0 disables
+EARLY_REFRESH_BETA = 1.0
+
+WARM_CACHE_PAGES = 3
+
+WARM_CACHE_POSTS = 20
+
+WARM_CACHE_WORKERS = 4
+
+WARM_CACHE_HOST = 'localhost'
+
+WARM_CACHE_AFTER_CHANGES = True
+
+WARM_CACHE_DELAY = 5
+
+BACKGROUND_DELETE_THRESHOLD = 1000
+
+MEDIA_GC_GRACE = 60 * 60
+
+IMAGE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+
+IMAGE_MAX_PIXELS = 25_000_000
+
+RATE_LIMITS = {
+    'post': '20/h',
+    'comment': '10/m',
+    'registration': '5/h',
+}
+
+RATE_LIMIT_VIEW = 'pages.views.too_many_requests'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+PAGE_LIMIT = 10
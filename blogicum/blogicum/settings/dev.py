@@ -0,0 +1,34 @@
+"""Local development: debug pages, toolbar, plain static files
+and the in-process object store
+"""
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE, STORAGES, env_flag
+
+DEBUG = True
+
+DEBUG_TOOLBAR = env_flag('DEBUG_TOOLBAR', True)
+
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+    MIDDLEWARE = [
+        *MIDDLEWARE[:-1],
+        'debug_toolbar.middleware.DebugToolbarMiddleware',
+        MIDDLEWARE[-1],
+    ]
+
+STORAGES = {
+    **STORAGES,
+    'objects': {
+        'BACKEND': 'blogicum.media_storage.ContentAddressedObjectStorage',
+        'OPTIONS': {'bucket': 'blogicum-media'},
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+TEMPLATES_PREWARM = False
+
+SINGLE_PROCESS = True
+
+WARM_CACHE_AFTER_CHANGES = False
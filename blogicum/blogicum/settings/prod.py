@@ -0,0 +1,70 @@
+"""Production: settings come from BLOGICUM_* environment variables.
+Database connections are kept open, templates are compiled at start,
+static files are hashed and pre-compressed.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, env, env_flag
+
+SECRET_KEY = env('SECRET_KEY')
+
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Set BLOGICUM_SECRET_KEY for production')
+
+DATABASES = {
+    'default': {
+        'ENGINE': env('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': env('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        'USER': env('DB_USER', ''),
+        'PASSWORD': env('DB_PASSWORD', ''),
+        'HOST': env('DB_HOST', ''),
+        'PORT': env('DB_PORT', ''),
+        'CONN_MAX_AGE': int(env('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+REDIS_URL = env('REDIS_URL')
+
+if not REDIS_URL:
+    raise ImproperlyConfigured(
+        'Set BLOGICUM_REDIS_URL for production: workers must share caches'
+    )
+
+CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': alias,
+    }
+    for alias in ('default', 'rate_limits')
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+EMAIL_HOST = env('EMAIL_HOST', 'localhost')
+
+STATIC_SERVE = env_flag('STATIC_SERVE')
+
+STATIC_MAX_AGE = 24 * 60 * 60
+
+SESSION_COOKIE_SECURE = env_flag('SECURE_COOKIES', True)
+
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum': {
+            'handlers': ['console'],
+            'level': env('LOG_LEVEL', 'INFO'),
+        },
+    },
+}
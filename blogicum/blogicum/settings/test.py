@@ -0,0 +1,24 @@
+"""Test runs: no toolbar, fast password hashing, plain static files
+and the in-process object store
+"""
+from .base import *  # noqa: F401,F403
+from .base import STORAGES
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+STORAGES = {
+    **STORAGES,
+    'objects': {
+        'BACKEND': 'blogicum.media_storage.ContentAddressedObjectStorage',
+        'OPTIONS': {'bucket': 'blogicum-media'},
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+TEMPLATES_PREWARM = False
+
+SINGLE_PROCESS = True
+
+WARM_CACHE_AFTER_CHANGES = False
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+BOOT_SCRIPT = '''
+import json
+import time
+
+start = time.perf_counter()
+import django
+django.setup()
+ready = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+loaded = time.perf_counter()
+print(json.dumps({'setup': ready - start, 'wsgi': loaded - ready}))
+'''
+
+
+@dataclass
+class StartupProfile:
+    """Boot time of a fresh process and import time per module, in seconds"""
+
+    setup: float
+    wsgi: float
+    imports: dict = field(default_factory=dict)
+
+    @property
+    def total(self):
+        return self.setup + self.wsgi
+
+    def by_package(self):
+        packages = defaultdict(float)
+        for module, seconds in self.imports.items():
+            packages[module.split('.')[0]] += seconds
+        return packages
+
+    def format(self, limit=20):
+        def top(times):
+            return '\n'.join(
+                f'  {seconds * 1000:8.1f} ms  {name}'
+                for name, seconds in sorted(
+                    times.items(), key=lambda item: -item[1]
+                )[:limit]
+            )
+        return (
+            f'Boot: {self.total * 1000:.1f} ms '
+            f'(django.setup {self.setup * 1000:.1f} ms, '
+            f'WSGI handler and URLconf {self.wsgi * 1000:.1f} ms)\n'
+            f'Import time by package:\n{top(self.by_package())}\n'
+            f'Import time by module:\n{top(self.imports)}'
+        )
+
+
+def parse_importtime(output):
+    """Get own import time of modules from python -X importtime output"""
+    imports = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, _, module = line[len('import time:'):].split('|')
+        if own.strip().isdigit():
+            imports[module.strip()] = int(own) / 1_000_000
+    return imports
+
+
+def profile_startup(settings_module=None):
+    """Boot the project in a fresh interpreter and time it"""
+    environment = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': (
+            settings_module or os.environ['DJANGO_SETTINGS_MODULE']
+        ),
+    }
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = json.loads(result.stdout.splitlines()[-1])
+    return StartupProfile(
+        times['setup'], times['wsgi'], parse_importtime(result.stderr)
+    )
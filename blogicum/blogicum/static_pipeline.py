@@ -0,0 +1,128 @@
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.xml', '.json', '.ico', '.map',
+)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def compress_file(path):
+    """Save gzip and, if brotli is installed, brotli siblings of the file"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    with gzip.open(f'{path}.gz', 'wb', compresslevel=9) as file:
+        file.write(content)
+    if brotli is not None:
+        with open(f'{path}.br', 'wb') as file:
+            file.write(brotli.compress(content))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage which pre-compresses collected text files.
+    Source maps are not shipped, so their references are left as is.
+    """
+
+    patterns = (
+        ('*.css', (
+            r"""(?P<matched>url\(['"]{0,1}\s*(?P<url>.*?)["']{0,1}\))""",
+            (
+                r"""(?P<matched>@import\s*["']\s*(?P<url>.*?)["'])""",
+                """@import url("%(url)s")""",
+            ),
+        )),
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in names:
+            if name and name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress_file(self.path(name))
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files from the application process
+    with pre-compressed variants and far-future caching of hashed names.
+    Enabled by STATIC_SERVE for deployments without a web server.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.immutable = set()
+        if isinstance(staticfiles_storage, ManifestStaticFilesStorage):
+            self.immutable = set(staticfiles_storage.hashed_files.values())
+
+    def __call__(self, request):
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.path.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def get_variant(self, request, path):
+        """Choose the smallest variant of the file client accepts"""
+        accepted = request.headers.get('Accept-Encoding', '')
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return path + suffix, encoding
+        return path, None
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        mtime = os.stat(path).st_mtime
+        if not was_modified_since(
+            request.headers.get('If-Modified-Since'), mtime
+        ):
+            return HttpResponseNotModified()
+        variant, encoding = self.get_variant(request, path)
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(variant, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Last-Modified'] = http_date(mtime)
+        if name in self.immutable:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}'
+            )
+        return response
@@ -0,0 +1,145 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template import engines
+from django.template.base import Template
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+logger = logging.getLogger('blogicum.templates')
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def find_template_names(dirs):
+    """Walk template directories and list names templates are loaded by"""
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    yield os.path.relpath(
+                        os.path.join(root, filename), directory
+                    ).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Compile every project and app template into cached loaders.
+    Returns names of templates which failed to compile with errors.
+    """
+    failed = {}
+    app_dirs = get_app_template_dirs('templates')
+    for engine in engines.all():
+        dirs = [*engine.engine.dirs, *app_dirs]
+        for name in dict.fromkeys(find_template_names(dirs)):
+            try:
+                engine.get_template(name)
+            except Exception as error:
+                failed[name] = error
+    return failed
+
+
+class RenderProfile:
+    """Render time per template: inclusive of nested includes and own"""
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.total = defaultdict(float)
+        self.own = defaultdict(float)
+        self._children = []
+
+    def measure(self, name, render):
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return render()
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.calls[name] += 1
+            self.total[name] += elapsed
+            self.own[name] += elapsed - children
+
+    def rows(self):
+        """Get (name, calls, total, own) sorted by own time"""
+        return sorted(
+            (
+                (name, self.calls[name], self.total[name], self.own[name])
+                for name in self.calls
+            ),
+            key=lambda row: row[3],
+            reverse=True,
+        )
+
+    def format(self):
+        return '\n'.join(
+            f'{name}: {calls} calls, {total * 1000:.2f} ms total, '
+            f'{own * 1000:.2f} ms own'
+            for name, calls, total, own in self.rows()
+        )
+
+
+def install_profiler():
+    """Wrap Template._render once to measure templates being profiled"""
+    with _lock:
+        if getattr(Template._render, 'profiled', False):
+            return
+        render = Template._render
+
+        def profiled_render(self, context):
+            profile = getattr(_local, 'profile', None)
+            if profile is None:
+                return render(self, context)
+            return profile.measure(
+                self.origin.template_name or self.name,
+                lambda: render(self, context),
+            )
+
+        profiled_render.profiled = True
+        Template._render = profiled_render
+
+
+@contextmanager
+def render_profile():
+    """Profile templates rendered by current thread inside the block"""
+    install_profiler()
+    previous = getattr(_local, 'profile', None)
+    _local.profile = RenderProfile()
+    try:
+        yield _local.profile
+    finally:
+        _local.profile = previous
+
+
+class TemplateProfilerMiddleware:
+    """Log render time per template and per include for every request
+    and expose it in the Server-Timing header.
+    Enabled by TEMPLATE_PROFILING.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with render_profile() as profile:
+            response = self.get_response(request)
+        if profile.calls:
+            logger.info(
+                'Templates rendered for %s %s:\n%s',
+                request.method, request.path, profile.format()
+            )
+            response.headers['Server-Timing'] = ', '.join(
+                f'tpl{number};desc="{name}";dur={own * 1000:.2f}'
+                for number, (name, _, _, own) in enumerate(profile.rows())
+            )
+        return response
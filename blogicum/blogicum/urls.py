@@ -3,6 +3,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from blogicum.media_storage import serve_object, uses_local_object_store
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
@@ -12,7 +14,13 @@ urlpatterns = [
     path('pages/', include('pages.urls')),
     path('admin/', admin.site.urls),
 ]
-if settings.DEBUG:
+if uses_local_object_store():
+    urlpatterns.append(path(
+        'object-store/<str:bucket>/<path:key>',
+        serve_object,
+        name='object_store'
+    ))
+if settings.DEBUG_TOOLBAR:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
 
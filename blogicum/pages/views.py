@@ -1,6 +1,8 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from blog.throttle_utils import retry_after
+
 
 class RulesPage(TemplateView):
     template_name = 'pages/rules.html'
@@ -22,3 +24,9 @@ def server_error(request):
 
 def csrf_failure(request, reason=''):
     return render(request, 'pages/403csrf.html', status=403)
+
+
+def too_many_requests(request, wait):
+    response = render(request, 'pages/429.html', status=429)
+    response['Retry-After'] = retry_after(wait)
+    return response
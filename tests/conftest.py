@@ -353,9 +353,9 @@ def cleanup(request):
 
     yield
 
-    from blogicum import settings
+    from django.conf import settings
 
-    image_dir = Path(settings.__file__).parent.parent / settings.MEDIA_ROOT
+    image_dir = Path(settings.MEDIA_ROOT)
 
     for root, dirs, files in os.walk(image_dir):
         for filename in files:
@@ -0,0 +1,62 @@
+import pytest
+from django.contrib.admin import helpers
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+CHANGELIST_URL = "/admin/blog/post/"
+
+
+def run_action(admin_client, action, posts, **data):
+    return admin_client.post(CHANGELIST_URL, {
+        "action": action,
+        "index": 0,
+        helpers.ACTION_CHECKBOX_NAME: [post.id for post in posts],
+        **data,
+    })
+
+
+@pytest.mark.django_db
+def test_unpublish_action(admin_client, many_posts_with_published_locations):
+    from blog.models import Post
+
+    posts = many_posts_with_published_locations
+    run_action(admin_client, "unpublish", posts[:1])
+    with CaptureQueriesContext(connection) as one_post:
+        run_action(admin_client, "unpublish", posts[1:2])
+    with CaptureQueriesContext(connection) as all_posts:
+        run_action(admin_client, "unpublish", posts[2:])
+    assert len(all_posts) == len(one_post), (
+        "Убедитесь, что число запросов действия не зависит от числа постов."
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    assert posts[0].title not in admin_client.get("/feeds/rss/").content.decode()
+
+
+@pytest.mark.django_db
+def test_move_to_category_asks_category(
+        admin_client, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    response = run_action(admin_client, "move_to_category", [post])
+    assert response.status_code == 200
+    assert "category" in response.context["form"].fields
+    run_action(
+        admin_client, "move_to_category", [post],
+        apply=1, category=another_category.id,
+    )
+    post.refresh_from_db()
+    assert post.category == another_category
+
+
+@pytest.mark.django_db
+def test_delete_with_comments_across_selection(
+        admin_client, comment_to_a_post, post_of_another_author
+):
+    from blog.models import Comment, Post
+
+    run_action(
+        admin_client, "delete_with_comments", [post_of_another_author],
+        select_across=1, apply=1,
+    )
+    assert not Post.objects.exists()
+    assert not Comment.objects.exists()
@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comment/"])
+def test_changelist_queries_do_not_grow(admin_client, mixer, url, user):
+    with CaptureQueriesContext(connection) as few_rows:
+        assert admin_client.get(url).status_code == 200
+    mixer.cycle(20).blend("blog.Comment", author=user)
+    with CaptureQueriesContext(connection) as many_rows:
+        assert admin_client.get(url).status_code == 200
+    assert len(many_rows) <= len(few_rows) + 1, (
+        "Убедитесь, что число запросов страницы списка в админке"
+        " не зависит от числа строк."
+    )
+
+
+@pytest.mark.django_db
+def test_author_filter_by_username(
+        admin_client, post_with_published_location, post_of_another_author
+):
+    author = post_of_another_author.author.username
+    response = admin_client.get(f"/admin/blog/post/?author={author}")
+    posts = list(response.context["cl"].result_list)
+    assert posts == [post_of_another_author]
+    assert f'value="{author}"' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_title_search_uses_index():
+    from blog.models import Post
+
+    queryset = Post.objects.filter(title__istartswith="заголовок").only("id")
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = " ".join(str(row) for row in cursor.fetchall())
+    assert "blog_post_title_prefix_idx" in plan, (
+        "Убедитесь, что поиск по началу заголовка использует индекс."
+    )
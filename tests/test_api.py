@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_posts_cursor_pagination(
+        client, many_posts_with_published_locations, future_posts
+):
+    ids = []
+    url = "/api/v1/posts/?limit=7"
+    while url:
+        data = client.get(url).json()
+        ids += [post["id"] for post in data["results"]]
+        url = (
+            f"/api/v1/posts/?limit=7&cursor={data['next_cursor']}"
+            if data["next_cursor"] else None
+        )
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    assert ids == [post.id for post in expected], (
+        "Убедитесь, что API отдаёт все видимые посты по курсору без"
+        " повторов и пропусков."
+    )
+
+
+@pytest.mark.django_db
+def test_post_sparse_fields(client, post_with_published_location):
+    post = post_with_published_location
+    data = client.get(f"/api/v1/posts/{post.id}/?fields=title,location").json()
+    assert data == {
+        "title": post.title,
+        "location": post.location.name,
+    }
+    response = client.get(f"/api/v1/posts/{post.id}/?fields=password")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_hidden_post_not_found(client, future_posts):
+    response = client.get(f"/api/v1/posts/{future_posts[0].id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    response = client.get(f"/api/v1/posts/{future_posts[0].id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_comments_and_etag(client, comment_to_a_post):
+    url = f"/api/v1/posts/{comment_to_a_post.post_id}/comments/"
+    response = client.get(url)
+    assert response.json()["results"][0]["text"] == comment_to_a_post.text
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_profile_hides_email(client, user):
+    data = client.get(f"/api/v1/profiles/{user.username}/").json()
+    assert data["username"] == user.username
+    assert "email" not in data
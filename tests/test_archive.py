@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.bulk_actions import bulk_delete_posts
+from blog.models import ArchiveMonth, Post
+
+
+@pytest.fixture
+def archive_posts(mixer, user, published_category, published_location):
+    cache.clear()
+    yield [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            location=published_location,
+            is_published=True,
+            pub_date=timezone.make_aware(datetime(2024, 5, day)),
+        )
+        for day in range(1, 14)
+    ] + [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.make_aware(datetime(2024, 4, 30)),
+        )
+    ]
+    cache.clear()
+
+
+def month_counts():
+    return dict(
+        ((row.year, row.month), row.post_count)
+        for row in ArchiveMonth.objects.all()
+    )
+
+
+@pytest.mark.django_db
+def test_archive_months_follow_posts(archive_posts):
+    may, april = archive_posts[0], archive_posts[-1]
+    assert month_counts() == {(2024, 5): 13, (2024, 4): 1}
+    may.is_published = False
+    may.save()
+    assert month_counts()[(2024, 5)] == 12, (
+        "Убедитесь, что снятые с публикации посты не считаются в архиве."
+    )
+    april.pub_date = may.pub_date
+    april.save()
+    assert month_counts() == {(2024, 5): 13, (2024, 4): 0}
+    archive_posts[1].delete()
+    bulk_delete_posts(
+        Post.objects.filter(pk__in=[post.pk for post in archive_posts[2:4]])
+    )
+    assert month_counts()[(2024, 5)] == 10
+    ArchiveMonth.objects.update(post_count=0)
+    call_command("rebuild_home_feed")
+    assert month_counts() == {(2024, 5): 10}
+
+
+@pytest.mark.django_db
+def test_archive_pages(client, archive_posts):
+    response = client.get("/archive/")
+    assert [
+        (row.year, row.month) for row in response.context["archive_months"]
+    ] == [(2024, 5), (2024, 4)]
+    url = "/archive/2024/5/"
+    first = client.get(url)
+    ids = [post.pk for post in first.context["object_list"]]
+    assert ids == [post.pk for post in archive_posts[12:2:-1]]
+    second = client.get(url, {"cursor": first.context["next_cursor"]})
+    ids += [post.pk for post in second.context["object_list"]]
+    assert ids == [post.pk for post in archive_posts[12::-1]], (
+        "Убедитесь, что архив месяца листается по курсору без пропусков."
+    )
+    assert second.context["next_cursor"] is None
+    assert client.get(url, {"cursor": "broken"}).status_code == 404
+    assert client.get("/archive/2024/6/").status_code == 404
+    repeated = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert repeated.status_code == 304
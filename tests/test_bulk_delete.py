@@ -0,0 +1,88 @@
+from io import StringIO
+
+import pytest
+from django.contrib.admin import helpers
+from django.core.management import call_command
+
+from blog.bulk_actions import _deletions, bulk_delete_users
+from blog.models import Comment, HomeFeedRow, PendingDeletion, Post
+
+
+@pytest.mark.django_db
+def test_delete_users_with_content(
+        mixer, user, another_user, post_with_published_location
+):
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    other_post = post_with_published_location
+    own_post = mixer.blend("blog.Post", author=another_user)
+    mixer.blend("blog.Comment", post=own_post, author=user)
+    mixer.blend("blog.Comment", post=other_post, author=another_user)
+    mixer.blend("blog.Comment", post=other_post, author=user)
+    progress = []
+    deleted = bulk_delete_users(
+        User.objects.filter(pk=another_user.pk), progress.append
+    )
+    assert deleted == 1 and progress == [1]
+    assert not User.objects.filter(pk=another_user.pk).exists()
+    assert list(Post.objects.all()) == [other_post]
+    assert Comment.objects.get().author == user
+    assert HomeFeedRow.objects.get(post=other_post).comment_count == 1, (
+        "Убедитесь, что счётчики комментариев пересчитываются после удаления."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_post_is_deleted_in_background(
+        settings, user_client, comment_to_a_post,
+):
+    post = comment_to_a_post.post
+    settings.BACKGROUND_DELETE_THRESHOLD = 0
+    response = user_client.post(f"/posts/{post.pk}/delete/")
+    assert response.status_code == 302
+    _deletions.submit(lambda: None).result()
+    assert not Post.objects.exists(), (
+        "Убедитесь, что большой пост удаляется в фоне."
+    )
+    assert not Comment.objects.exists()
+    assert not PendingDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+def test_interrupted_deletion_is_resumed(
+        settings, django_capture_on_commit_callbacks, user_client,
+        comment_to_a_post,
+):
+    post = comment_to_a_post.post
+    settings.BACKGROUND_DELETE_THRESHOLD = 0
+    with django_capture_on_commit_callbacks() as callbacks:
+        user_client.post(f"/posts/{post.pk}/delete/")
+    assert len(callbacks) == 1
+    post.refresh_from_db()
+    assert not post.is_published, (
+        "Убедитесь, что большой пост скрывается до удаления в фоне."
+    )
+    assert PendingDeletion.objects.get().pks == [post.pk], (
+        "Убедитесь, что отложенное удаление сохраняется в базе."
+    )
+    call_command("resume_deletions", stdout=StringIO())
+    assert not Post.objects.exists()
+    assert not Comment.objects.exists()
+    assert not PendingDeletion.objects.exists()
+
+
+@pytest.mark.django_db
+def test_admin_deletes_users_with_content(
+        admin_client, mixer, user, post_of_another_author
+):
+    mixer.blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", post=post_of_another_author, author=user)
+    admin_client.post("/admin/auth/user/", {
+        "action": "delete_with_content",
+        "index": 0,
+        helpers.ACTION_CHECKBOX_NAME: [user.pk],
+        "apply": 1,
+    })
+    assert not Comment.objects.exists()
+    assert list(Post.objects.all()) == [post_of_another_author]
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_getter",
+    [
+        lambda post: "/",
+        lambda post: f"/category/{post.category.slug}/",
+        lambda post: f"/profile/{post.author.username}/",
+        lambda post: f"/posts/{post.id}/",
+    ],
+)
+def test_unchanged_page_not_modified(
+        user_client, post_with_published_location, url_getter
+):
+    url = url_getter(post_with_published_location)
+    response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag"), (
+        f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+    )
+    assert response.has_header("Last-Modified")
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f"Убедитесь, что неизменившаяся страница `{url}` отвечает кодом 304."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_changes_etag(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+    user_client.post(f"{url}comment/", data={"text": "Новый комментарий"})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после добавления комментария страница поста"
+        " отдаётся заново."
+    )
+
+
+@pytest.mark.django_db
+def test_etag_differs_between_users(
+        user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_validators_survive_cache_loss(
+        user_client, mixer, post_with_published_location
+):
+    from django.core.cache import cache
+
+    author = post_with_published_location.author
+    url = f"/profile/{author.username}/"
+    cache.clear()
+    old_etag = user_client.get(url)["ETag"]
+    newer = mixer.blend(
+        "blog.Post", author=author, is_published=True,
+        category=post_with_published_location.category,
+    )
+    newer.delete()
+    cache.clear()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=old_etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после удаления поста и очистки кэша страница"
+        " не отвечает кодом 304 на старый ETag."
+    )
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", ["rss", "atom"])
+def test_site_feed(client, post_with_published_location, kind):
+    response = client.get(f"/feeds/{kind}/")
+    assert response.status_code == HTTPStatus.OK
+    assert post_with_published_location.title in response.content.decode(), (
+        "Убедитесь, что опубликованный пост попадает в ленту."
+    )
+    response = client.get(
+        f"/feeds/{kind}/", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_scoped_feeds(client, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        f"/feeds/category/{post.category.slug}/rss/",
+        f"/feeds/profile/{post.author.username}/atom/",
+    ):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_follows_post_changes(client, post_with_published_location):
+    post = post_with_published_location
+    etag = client.get("/feeds/rss/")["ETag"]
+    post.is_published = False
+    post.save()
+    response = client.get("/feeds/rss/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert post.title not in response.content.decode(), (
+        "Убедитесь, что снятый с публикации пост пропадает из ленты."
+    )
+    post.category.is_published = False
+    post.category.save()
+    post.is_published = True
+    post.save()
+    assert post.title not in client.get("/feeds/rss/").content.decode(), (
+        "Убедитесь, что посты скрытой категории не попадают в ленту."
+    )
@@ -0,0 +1,93 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import HomeFeedRow, Post
+
+
+@pytest.mark.django_db
+def test_rows_follow_posts(post_with_published_location):
+    post = post_with_published_location
+    row = HomeFeedRow.objects.get(post=post)
+    assert row.title == post.title
+    assert row.category_slug == post.category.slug
+    post.is_published = False
+    post.save()
+    assert not HomeFeedRow.objects.filter(post=post).exists(), (
+        "Убедитесь, что снятый с публикации пост пропадает из ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_rows_follow_category(post_with_published_location):
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    assert not HomeFeedRow.objects.exists(), (
+        "Убедитесь, что посты скрытой категории пропадают из ленты."
+    )
+    category.is_published = True
+    category.save()
+    assert HomeFeedRow.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_rows_follow_copied_fields_only(post_with_published_location):
+    category = post_with_published_location.category
+    location = post_with_published_location.location
+    updated_at = HomeFeedRow.objects.get().updated_at
+    category.description = "Новое описание"
+    category.save()
+    assert HomeFeedRow.objects.get().updated_at == updated_at, (
+        "Убедитесь, что правка описания категории не трогает ленту."
+    )
+    category.title = "Новое название"
+    category.save()
+    location.name = "Новое место"
+    location.save()
+    row = HomeFeedRow.objects.get()
+    assert (row.category_title, row.location_name) == (
+        "Новое название", "Новое место"
+    )
+
+
+@pytest.mark.django_db
+def test_row_counts_comments(comment_to_a_post):
+    post = comment_to_a_post.post
+    assert HomeFeedRow.objects.get(post=post).comment_count == 1
+    comment_to_a_post.delete()
+    assert HomeFeedRow.objects.get(post=post).comment_count == 0, (
+        "Убедитесь, что лента хранит актуальное число комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_home_page_reads_feed_rows(client, many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    posts = list(response.context["page_obj"])
+    assert posts and posts[0].author.username
+    assert not any(
+        " JOIN " in query["sql"] for query in queries.captured_queries
+    ), "Убедитесь, что главная страница читает ленту без соединений таблиц."
+
+
+@pytest.mark.django_db
+def test_rebuild_home_feed(post_with_published_location):
+    HomeFeedRow.objects.all().delete()
+    call_command("rebuild_home_feed", stdout=StringIO())
+    assert HomeFeedRow.objects.filter(
+        post=post_with_published_location
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_fixture_loads_without_derived_rows(settings):
+    call_command("loaddata", settings.BASE_DIR / "db.json", verbosity=0)
+    assert Post.objects.exists()
+    assert not HomeFeedRow.objects.exists(), (
+        "Убедитесь, что загрузка фикстур не запускает обработчики сигналов."
+    )
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from blog.models import Post
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_GC_GRACE = 0
+    return tmp_path
+
+
+def test_equal_uploads_share_file(media_root):
+    first = default_storage.save("post_images/a.JPG", ContentFile(b"one"))
+    second = default_storage.save("post_images/b.jpg", ContentFile(b"one"))
+    other = default_storage.save("post_images/c.jpg", ContentFile(b"two"))
+    assert first == second != other, (
+        "Убедитесь, что одинаковые файлы сохраняются один раз."
+    )
+    assert first.startswith("post_images/") and first.endswith(".jpg")
+    assert len(list(media_root.rglob("*.jpg"))) == 2
+
+
+@pytest.mark.django_db
+def test_replaced_and_deleted_images_are_removed(
+        media_root, django_capture_on_commit_callbacks,
+        post_with_published_location, post_of_another_author,
+):
+    post, other = post_with_published_location, post_of_another_author
+    shared = default_storage.save("post_images/a.jpg", ContentFile(b"one"))
+    Post.objects.filter(pk__in=[post.pk, other.pk]).update(image=shared)
+    post.refresh_from_db()
+    other.refresh_from_db()
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image.save("b.jpg", ContentFile(b"two"))
+    assert default_storage.exists(shared), (
+        "Убедитесь, что файл, на который ссылаются другие посты, не удаляется."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        other.delete()
+    assert not default_storage.exists(shared)
+    replaced = post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image.save("c.jpg", ContentFile(b"three"))
+    assert not default_storage.exists(replaced)
+
+
+@pytest.mark.django_db
+def test_gc_media_deletes_orphans(media_root, post_with_published_location):
+    post = post_with_published_location
+    post.image.save("used.jpg", ContentFile(b"used"))
+    orphan = default_storage.save("post_images/x.jpg", ContentFile(b"x"))
+    call_command("gc_media", "--dry-run", stdout=open(os.devnull, "w"))
+    assert default_storage.exists(orphan)
+    call_command("gc_media", "--batch-size=1", stdout=open(os.devnull, "w"))
+    assert not default_storage.exists(orphan)
+    assert default_storage.exists(post.image.name)
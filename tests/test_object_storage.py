@@ -0,0 +1,105 @@
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+
+from blogicum.media_storage import (
+    ContentAddressedObjectStorage,
+    LocalObjectStore,
+    ObjectStorage,
+    uses_local_object_store,
+)
+
+
+@pytest.fixture
+def bucket():
+    yield "test-media"
+    LocalObjectStore._buckets.pop("test-media", None)
+
+
+def test_multipart_upload_and_listing(bucket):
+    storage = ObjectStorage(bucket, part_size=10, upload_workers=2)
+    content = bytes(range(256)) * 3
+    name = storage.save("post_images/big.jpg", ContentFile(content))
+    storage.save("post_images/small.jpg", ContentFile(b"small"))
+    storage.save("root.txt", ContentFile(b"root"))
+    assert storage.open(name).read() == content, (
+        "Убедитесь, что файл, загруженный по частям, собирается верно."
+    )
+    assert storage.size(name) == len(content)
+    assert storage.listdir("") == (["post_images"], ["root.txt"])
+    assert sorted(storage.listdir("post_images")[1]) == [
+        "big.jpg", "small.jpg"
+    ]
+    storage.delete(name)
+    assert not storage.exists(name)
+    with pytest.raises(FileNotFoundError):
+        storage.open(name)
+
+
+def test_signed_urls(client, bucket):
+    storage = ContentAddressedObjectStorage(bucket)
+    name = storage.save("post_images/a.jpg", ContentFile(b"image"))
+    url = storage.url(name)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"image"
+    assert client.get(url.replace("Signature=", "Signature=0")).status_code \
+        == 403, "Убедитесь, что ссылки без верной подписи не работают."
+    assert client.get(url.split("?")[0]).status_code == 403
+
+
+def test_copy_media(settings, tmp_path, bucket):
+    source = FileSystemStorage(location=tmp_path)
+    source.save("post_images/aa/one.jpg", ContentFile(b"one"))
+    source.save("post_images/two.jpg", ContentFile(b"two"))
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "source": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tmp_path},
+        },
+        "target": {
+            "BACKEND": "blogicum.media_storage.ContentAddressedObjectStorage",
+            "OPTIONS": {"bucket": bucket},
+        },
+    }
+    call_command(
+        "copy_media", "source", "target", "--workers=2",
+        stdout=open(os.devnull, "w"),
+    )
+    target = ObjectStorage(bucket)
+    assert target.open("post_images/aa/one.jpg").read() == b"one", (
+        "Убедитесь, что файлы копируются под прежними именами."
+    )
+    assert target.exists("post_images/two.jpg")
+
+
+def test_reused_object_is_kept_fresh(bucket):
+    storage = ContentAddressedObjectStorage(bucket)
+    name = storage.save("post_images/a.jpg", ContentFile(b"image"))
+    stored = LocalObjectStore._buckets[bucket][name]
+    stored["LastModified"] -= timedelta(days=1)
+    old = storage.get_modified_time(name)
+    assert storage.save("post_images/b.jpg", ContentFile(b"image")) == name
+    assert storage.get_modified_time(name) > old, (
+        "Убедитесь, что повторно загруженный объект считается свежим."
+    )
+    assert storage.head(name)["ContentType"] == "image/jpeg"
+
+
+def test_object_urls_served_only_for_local_store(settings):
+    assert uses_local_object_store()
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "objects": {
+            "BACKEND": "blogicum.media_storage.ContentAddressedObjectStorage",
+            "OPTIONS": {"bucket": "media", "client": "boto3.client"},
+        },
+    }
+    assert not uses_local_object_store(), (
+        "Убедитесь, что сайт не отдаёт объекты, если хранилище внешнее."
+    )
@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import cache
+
+from blog.paginators import CachedCountPaginator
+
+
+@pytest.mark.django_db
+def test_page_range_elided(user_client, mixer, user, published_category):
+    mixer.cycle(200).blend("blog.Post", author=user, category=published_category)
+    response = user_client.get("/?page=10")
+    page_links = response.content.decode().count('class="page-link"')
+    assert page_links < 20, (
+        "Убедитесь, что пагинатор выводит ссылки не на все страницы."
+    )
+    assert "…" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_count_cached_until_scope_changes(
+        django_assert_num_queries, many_posts_with_published_locations
+):
+    from blog.models import Post
+
+    cache.clear()
+    queryset = Post.objects.all()
+    with django_assert_num_queries(2):
+        assert CachedCountPaginator(queryset, 10, count_scope="index").count == 20
+    with django_assert_num_queries(0):
+        assert CachedCountPaginator(queryset, 10, count_scope="index").count == 20
+    many_posts_with_published_locations[0].delete()
+    assert CachedCountPaginator(queryset, 10, count_scope="index").count == 19
@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import caches
+
+from blog.throttle_utils import take_token
+
+
+@pytest.fixture
+def rate_limits(settings):
+    settings.RATE_LIMITS = {
+        "comment": "2/m",
+        "registration": "1/h",
+    }
+    caches[settings.RATE_LIMIT_CACHE].clear()
+    yield settings.RATE_LIMITS
+    caches[settings.RATE_LIMIT_CACHE].clear()
+
+
+@pytest.mark.django_db
+def test_comments_throttled(
+        rate_limits, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/comment/"
+    for _ in range(2):
+        assert user_client.post(url, {"text": "Текст"}).status_code == 302
+    response = user_client.post(url, {"text": "Текст"})
+    assert response.status_code == 429, (
+        "Убедитесь, что частые комментарии отклоняются с кодом 429."
+    )
+    assert 0 < int(response["Retry-After"]) <= 30
+    assert post_with_published_location.comments.count() == 2
+
+
+@pytest.mark.django_db
+def test_registration_throttled_by_address(rate_limits, client):
+    data = {
+        "username": "spammer",
+        "password1": "Sup3r-secret",
+        "password2": "Sup3r-secret",
+    }
+    assert client.post("/auth/registration/", data).status_code == 302
+    data["username"] = "another_spammer"
+    response = client.post("/auth/registration/", data)
+    assert response.status_code == 429
+    assert client.get("/auth/registration/").status_code == 200, (
+        "Убедитесь, что ограничение не касается чтения страниц."
+    )
+
+
+def test_bucket_refills(rate_limits):
+    assert take_token("comment", "test", now=0) == 0
+    assert take_token("comment", "test", now=0) == 0
+    assert take_token("comment", "test", now=1) == pytest.approx(29)
+    assert take_token("comment", "test", now=30) == 0
+    assert take_token("unlimited", "test", now=30) == 0
+
+
+def test_overlapping_calls_on_full_bucket(rate_limits, settings):
+    from threading import Timer
+
+    from blog.constants import RATE_LIMIT_KEY, RATE_LIMIT_LOCK_KEY
+
+    key = RATE_LIMIT_KEY.format(scope="comment", client="test")
+    lock = RATE_LIMIT_LOCK_KEY.format(key=key)
+    counters = caches[settings.RATE_LIMIT_CACHE]
+    counters.add(lock, True)
+    Timer(0.05, counters.delete, [lock]).start()
+    assert take_token("comment", "test", now=0) == 0, (
+        "Убедитесь, что одновременный запрос с полным запасом токенов"
+        " не отклоняется."
+    )
+    assert take_token("comment", "test", now=0) == 0
+    assert take_token("comment", "test", now=0) > 0, (
+        "Убедитесь, что одновременные запросы не берут один токен дважды."
+    )
@@ -0,0 +1,73 @@
+import importlib
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+
+def load_profile(monkeypatch, name, **environment):
+    for key, value in environment.items():
+        monkeypatch.setenv(f"BLOGICUM_{key}", value)
+    module = importlib.import_module(f"blogicum.settings.{name}")
+    return importlib.reload(module)
+
+
+def test_prod_profile(monkeypatch):
+    prod = load_profile(
+        monkeypatch, "prod",
+        SECRET_KEY="secret", ALLOWED_HOSTS="example.com", DB_CONN_MAX_AGE="300",
+        REDIS_URL="redis://cache:6379/0",
+    )
+    assert not prod.DEBUG and not prod.DEBUG_TOOLBAR
+    assert "debug_toolbar" not in prod.INSTALLED_APPS, (
+        "Убедитесь, что в боевом профиле нет debug_toolbar."
+    )
+    assert prod.DATABASES["default"]["CONN_MAX_AGE"] == 300
+    loaders = prod.TEMPLATES[0]["OPTIONS"]["loaders"]
+    assert loaders[0][0] == "django.template.loaders.cached.Loader"
+    assert "Compressed" in prod.STORAGES["staticfiles"]["BACKEND"]
+    assert prod.TEMPLATES_PREWARM and prod.WARM_CACHE_AFTER_CHANGES
+    for alias, cache in prod.CACHES.items():
+        assert "locmem" not in cache["BACKEND"].lower(), (
+            f"Убедитесь, что кеш {alias} в боевом профиле общий"
+            " для всех процессов."
+        )
+
+
+def test_prod_profile_requires_secret_key(monkeypatch):
+    monkeypatch.delenv("BLOGICUM_SECRET_KEY", raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        load_profile(monkeypatch, "prod")
+
+
+def test_prod_profile_requires_shared_cache(monkeypatch):
+    monkeypatch.delenv("BLOGICUM_REDIS_URL", raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        load_profile(monkeypatch, "prod", SECRET_KEY="secret")
+
+
+def test_dev_profile(monkeypatch):
+    dev = load_profile(monkeypatch, "dev", DEBUG_TOOLBAR="off")
+    assert dev.DEBUG and "debug_toolbar" not in dev.INSTALLED_APPS
+    dev = load_profile(monkeypatch, "dev", DEBUG_TOOLBAR="on")
+    assert dev.INSTALLED_APPS.count("debug_toolbar") == 1
+    assert dev.MIDDLEWARE[-1] == (
+        "blogicum.template_tools.TemplateProfilerMiddleware"
+    )
+
+
+def test_profile_runs_alone(monkeypatch):
+    import sys
+
+    from blogicum.settings import settings_module
+
+    monkeypatch.delitem(sys.modules, "blogicum.settings.dev", raising=False)
+    monkeypatch.delitem(sys.modules, "blogicum.settings.prod", raising=False)
+    load_profile(monkeypatch, "test")
+    assert not {"blogicum.settings.dev", "blogicum.settings.prod"} & set(
+        sys.modules
+    ), "Убедитесь, что импорт профиля не запускает другие профили."
+    monkeypatch.setenv("BLOGICUM_PROFILE", "prod")
+    assert settings_module() == "blogicum.settings.prod"
+    monkeypatch.setenv("BLOGICUM_PROFILE", "stage")
+    with pytest.raises(ImproperlyConfigured):
+        settings_module()
@@ -0,0 +1,51 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+EDIT_POST = "Отредактировать публикацию"
+EDIT_COMMENT = "Отредактировать комментарий"
+
+
+@pytest.fixture
+def shared_pages():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_shared_page_fills_user_parts(
+        shared_pages, client, user_client, another_user_client, user,
+        mixer, post_with_published_location,
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=user)
+    url = f"/posts/{post.pk}/"
+    anonymous = client.get(url).content.decode()
+    assert EDIT_POST not in anonymous and "Войти" in anonymous
+    with CaptureQueriesContext(connection) as queries:
+        own = user_client.get(url).content.decode()
+    assert not any(
+        '"blog_comment"."text"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что тело страницы берётся из общего кэша."
+    assert EDIT_POST in own and EDIT_COMMENT in own
+    assert f"@{user.username}" in own and "Выйти" in own
+    another = another_user_client.get(url).content.decode()
+    assert EDIT_POST not in another and EDIT_COMMENT not in another, (
+        "Убедитесь, что ссылки автора не попадают к другим пользователям."
+    )
+    assert "Оставить комментарий" in another
+
+
+@pytest.mark.django_db
+def test_owner_profile_is_cached_apart(
+        shared_pages, client, user_client, user, mixer
+):
+    hidden = mixer.blend("blog.Post", author=user, is_published=False)
+    url = f"/profile/{user.username}/"
+    assert hidden.title in user_client.get(url).content.decode()
+    assert hidden.title not in client.get(url).content.decode(), (
+        "Убедитесь, что страница владельца профиля кэшируется отдельно."
+    )
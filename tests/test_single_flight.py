@@ -0,0 +1,67 @@
+from hashlib import md5
+
+import pytest
+from django.core.cache import cache
+
+from blog.cache_utils import single_flight
+from blog.constants import PAGE_CACHE_KEY, SINGLE_FLIGHT_LOCK_KEY
+
+
+@pytest.fixture
+def empty_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def fail():
+    raise AssertionError("Пересчёт должен выполнять только один воркер.")
+
+
+def test_stale_value_served_while_locked(empty_cache):
+    assert single_flight("key", "v1", lambda: "old", 60) == ("old", False)
+    cache.add(SINGLE_FLIGHT_LOCK_KEY.format(key="key"), True)
+    assert single_flight("key", "v2", fail, 60) == ("old", True)
+    cache.delete(SINGLE_FLIGHT_LOCK_KEY.format(key="key"))
+    assert single_flight("key", "v2", lambda: "new", 60) == ("new", False)
+    assert single_flight("key", "v2", fail, 60) == ("new", False)
+
+
+def test_builds_without_waiting_for_lock(empty_cache, monkeypatch):
+    import time
+
+    monkeypatch.setattr(time, "sleep", fail)
+    cache.add(SINGLE_FLIGHT_LOCK_KEY.format(key="key"), True)
+    assert single_flight("key", "v1", lambda: "value", 60) == (
+        "value", False
+    )
+    assert cache.get("key") is None, (
+        "Убедитесь, что значение без блокировки не попадает в кэш."
+    )
+
+
+def test_early_refresh(empty_cache, settings):
+    single_flight("key", "v1", lambda: "old", 60)
+    settings.EARLY_REFRESH_BETA = 0
+    assert single_flight("key", "v1", fail, 60) == ("old", False)
+    settings.EARLY_REFRESH_BETA = 10 ** 12
+    assert single_flight("key", "v1", lambda: "new", 60) == ("new", False), (
+        "Убедитесь, что запись может обновиться до истечения срока."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_page_is_not_revalidated(
+        empty_cache, client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.pk}/"
+    assert "ETag" in client.get(url)
+    mixer.blend("blog.Comment", post=post, text="Свежий комментарий")
+    page_key = PAGE_CACHE_KEY.format(page=md5(f"{url}:".encode()).hexdigest())
+    cache.add(SINGLE_FLIGHT_LOCK_KEY.format(key=page_key), True)
+    response = client.get(url)
+    assert "Свежий комментарий" not in response.content.decode()
+    assert "ETag" not in response and "no-cache" in response["Cache-Control"], (
+        "Убедитесь, что устаревшая копия страницы не помечается ETag."
+    )
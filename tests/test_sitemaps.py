@@ -0,0 +1,106 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+
+@pytest.fixture
+def sitemap_root(tmp_path):
+    with override_settings(SITEMAP_ROOT=tmp_path):
+        yield tmp_path
+
+
+def read_shard(sitemap_root, name):
+    with gzip.open(sitemap_root / name, "rt", encoding="utf-8") as file:
+        return file.read()
+
+
+@pytest.mark.django_db
+def test_sitemaps_built(
+        client, sitemap_root, post_with_published_location, future_posts
+):
+    post = post_with_published_location
+    call_command("build_sitemaps", "--full")
+    index = (sitemap_root / "sitemap.xml").read_text()
+    for name in ("posts-0.xml.gz", "categories-0.xml.gz", "profiles-0.xml.gz"):
+        assert f"/sitemaps/{name}" in index, (
+            "Убедитесь, что индекс карты сайта ссылается на все её части."
+        )
+    posts = read_shard(sitemap_root, "posts-0.xml.gz")
+    assert f"/posts/{post.id}/</loc>" in posts
+    for future_post in future_posts:
+        assert f"/posts/{future_post.id}/</loc>" not in posts, (
+            "Убедитесь, что в карту сайта не попадают отложенные посты."
+        )
+    assert f"/category/{post.category.slug}/" in read_shard(
+        sitemap_root, "categories-0.xml.gz"
+    )
+    assert client.get("/sitemap.xml").status_code == HTTPStatus.OK
+    assert client.get("/sitemaps/posts-0.xml.gz").status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_changed_shards_rebuilt(sitemap_root, post_with_published_location):
+    post = post_with_published_location
+    call_command("build_sitemaps", "--full")
+    (sitemap_root / "categories-0.xml.gz").unlink()
+    post.is_published = False
+    post.save()
+    call_command("build_sitemaps")
+    assert f"/posts/{post.id}/" not in read_shard(
+        sitemap_root, "posts-0.xml.gz"
+    ), "Убедитесь, что изменённые части карты сайта перегенерируются."
+    assert not (sitemap_root / "categories-0.xml.gz").exists(), (
+        "Убедитесь, что неизменённые части карты сайта не перегенерируются."
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_post_added_when_due(sitemap_root, future_posts):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from blog.models import Category, Post, SitemapShard
+
+    post = future_posts[0]
+    Category.objects.filter(pk=post.category_id).update(is_published=True)
+    Post.objects.filter(pk=post.pk).update(is_published=True)
+    call_command("build_sitemaps", "--full")
+    assert "/posts/" not in read_shard(sitemap_root, "posts-0.xml.gz")
+    assert "posts-0.xml.gz" not in (sitemap_root / "sitemap.xml").read_text(), (
+        "Убедитесь, что пустые части не попадают в индекс карты сайта."
+    )
+    now = timezone.now()
+    SitemapShard.objects.update(generated_at=now - timedelta(hours=1))
+    Post.objects.filter(pk=post.pk).update(pub_date=now - timedelta(minutes=1))
+    call_command("build_sitemaps")
+    assert f"/posts/{post.id}/</loc>" in read_shard(
+        sitemap_root, "posts-0.xml.gz"
+    ), "Убедитесь, что пост попадает в карту сайта, когда наступает его время."
+    assert "posts-0.xml.gz" in (sitemap_root / "sitemap.xml").read_text()
+
+
+@pytest.mark.django_db
+def test_category_edit_rebuilds_posts_on_slug_change(
+        sitemap_root, post_with_published_location
+):
+    from blog.models import SitemapShard
+
+    category = post_with_published_location.category
+    call_command("build_sitemaps", "--full")
+    category.description = "Новое описание"
+    category.save()
+    assert not SitemapShard.objects.filter(
+        section="posts", is_dirty=True
+    ).exists(), (
+        "Убедитесь, что правка описания категории не перестраивает"
+        " карту постов."
+    )
+    category.slug = "new-slug"
+    category.save()
+    assert SitemapShard.objects.filter(
+        section="posts", is_dirty=True
+    ).exists()
@@ -0,0 +1,28 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blogicum.startup_tools import parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       2620 | django.conf
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(IMPORTTIME) == {
+        "_io": 0.00012, "django.conf": 0.0025
+    }
+
+
+def test_startup_over_budget():
+    out = StringIO()
+    with pytest.raises(CommandError, match="budget"):
+        call_command("profile_startup", "--budget=0", "--limit=3", stdout=out)
+    report = out.getvalue()
+    assert "django.setup" in report and "blog" in report, (
+        "Убедитесь, что отчёт показывает время загрузки по модулям."
+    )
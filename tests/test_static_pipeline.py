@@ -0,0 +1,56 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blogicum.static_pipeline import StaticFilesMiddleware
+
+STORAGE = "blogicum.static_pipeline.CompressedManifestStaticFilesStorage"
+
+
+@pytest.fixture
+def collected_static(tmp_path):
+    with override_settings(
+        STATIC_ROOT=tmp_path,
+        STATIC_SERVE=True,
+        STORAGES={
+            "default": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+            },
+            "staticfiles": {"BACKEND": STORAGE},
+        },
+    ):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        yield tmp_path
+
+
+def get_static(path, **headers):
+    middleware = StaticFilesMiddleware(lambda request: HttpResponse())
+    return middleware(RequestFactory().get(path, headers=headers))
+
+
+def test_hashed_files_compressed_and_immutable(collected_static):
+    from django.templatetags.static import static
+
+    url = static("css/bootstrap.min.css")
+    assert url != "/static_dev/css/bootstrap.min.css", (
+        "Убедитесь, что в production имена статических файлов содержат хеш."
+    )
+    response = get_static(url, accept_encoding="gzip, deflate")
+    assert response["Content-Encoding"] == "gzip"
+    assert "immutable" in response["Cache-Control"]
+    content = gzip.decompress(b"".join(response.streaming_content))
+    assert content == (collected_static / url[len("/static_dev/"):]).read_bytes()
+
+
+def test_unhashed_files_short_cache(collected_static):
+    response = get_static("/static_dev/img/logo.png")
+    assert "Content-Encoding" not in response
+    assert "immutable" not in response["Cache-Control"]
+
+
+def test_missing_file_passed_through(collected_static):
+    response = get_static("/static_dev/../settings.py")
+    assert response.status_code == 200 and response.content == b""
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog import subscription_utils
+from blog.models import InboxEntry, Subscription
+
+
+def blend_post(mixer, **kwargs):
+    return mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def fanout_limit(monkeypatch):
+    """Make every followed author popular, cached flags are dropped"""
+    monkeypatch.setattr(subscription_utils, "FANOUT_FOLLOWER_LIMIT", 0)
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def feed_posts(client):
+    return list(client.get("/subscriptions/").context["page_obj"])
+
+
+@pytest.mark.django_db
+def test_follow_author_fills_inbox(mixer, user, user_client, another_user):
+    old_post = blend_post(mixer, author=another_user)
+    user_client.post(f"/profile/{another_user.username}/follow/")
+    assert Subscription.objects.filter(
+        subscriber=user, author=another_user
+    ).exists()
+    new_post = blend_post(mixer, author=another_user)
+    assert set(
+        InboxEntry.objects.filter(user=user).values_list("post", flat=True)
+    ) == {old_post.pk, new_post.pk}, (
+        "Убедитесь, что публикации автора попадают в ленту подписчика."
+    )
+    assert set(feed_posts(user_client)) == {old_post, new_post}
+    user_client.post(f"/profile/{another_user.username}/unfollow/")
+    assert not InboxEntry.objects.filter(user=user).exists()
+    assert feed_posts(user_client) == []
+
+
+@pytest.mark.django_db
+def test_follow_category(mixer, user, user_client, another_user):
+    post = blend_post(mixer, author=another_user)
+    user_client.post(f"/category/{post.category.slug}/follow/")
+    assert feed_posts(user_client) == [post]
+    post.is_published = False
+    post.save()
+    assert not InboxEntry.objects.filter(user=user).exists(), (
+        "Убедитесь, что снятые с публикации посты удаляются из ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_cannot_follow_self(user, user_client):
+    user_client.post(f"/profile/{user.username}/follow/")
+    assert not Subscription.objects.exists()
+
+
+@pytest.mark.django_db
+def test_popular_author_is_read_on_demand(
+        mixer, fanout_limit, user, user_client, another_user
+):
+    user_client.post(f"/profile/{another_user.username}/follow/")
+    post = blend_post(mixer, author=another_user)
+    assert not InboxEntry.objects.exists(), (
+        "Убедитесь, что посты популярных авторов не пишутся во все ленты."
+    )
+    assert feed_posts(user_client) == [post]
+
+
+@pytest.mark.django_db
+def test_feed_requires_login(client):
+    response = client.get("/subscriptions/")
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_feed_merges_inbox_and_popular_sources(
+        mixer, monkeypatch, user, another_user
+):
+    monkeypatch.setattr(subscription_utils, "FANOUT_FOLLOWER_LIMIT", 1)
+    cache.clear()
+    popular, regular = mixer.cycle(2).blend("auth.User")
+    subscription_utils.follow(another_user, author=popular)
+    subscription_utils.follow(user, author=popular)
+    subscription_utils.follow(user, author=regular)
+    cache.clear()
+    posts = [
+        mixer.blend(
+            "blog.Post", author=author, is_published=True,
+            category__is_published=True,
+            pub_date=timezone.now() - timedelta(hours=hours + 1),
+        )
+        for hours, author in enumerate([regular, popular, regular, popular])
+    ]
+    assert subscription_utils.popular_sources(
+        "author", [popular.pk, regular.pk]
+    ) == {popular.pk}
+    assert subscription_utils.is_popular("author", popular.pk)
+    feed = subscription_utils.subscription_feed(user)
+    assert feed.count() == 4
+    assert feed[1:3] == posts[1:3], (
+        "Убедитесь, что лента собирается из личной ленты и популярных"
+        " источников по дате публикации."
+    )
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_feed_pages_are_linked(mixer, settings, user, user_client):
+    author = mixer.blend("auth.User")
+    subscription_utils.follow(user, author=author)
+    for _ in range(settings.PAGE_LIMIT + 1):
+        blend_post(mixer, author=author)
+    response = user_client.get("/subscriptions/")
+    assert response.context["paginator"].count == settings.PAGE_LIMIT + 1
+    assert "?page=2" in response.content.decode(), (
+        "Убедитесь, что в ленте подписок выводятся ссылки на страницы."
+    )
+
+
+@pytest.mark.django_db
+def test_follow_keeps_shared_scopes(mixer, user_client, another_user):
+    from blog.models import ScopeVersion
+
+    post = blend_post(mixer, author=another_user)
+    url = f"/profile/{another_user.username}/"
+    etag = user_client.get(url)["ETag"]
+    versions = list(ScopeVersion.objects.values_list("scope", "touched_at"))
+    user_client.post(f"{url}follow/")
+    user_client.post(f"/category/{post.category.slug}/follow/")
+    assert list(
+        ScopeVersion.objects.values_list("scope", "touched_at")
+    ) == versions, "Убедитесь, что подписка не сбрасывает общий кэш страниц."
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что подписка меняет ETag страницы подписчика."
+    )
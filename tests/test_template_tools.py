@@ -0,0 +1,32 @@
+import pytest
+from django.core.management import call_command
+
+from blogicum.template_tools import render_profile
+
+
+def test_all_templates_compile():
+    call_command("warm_templates")
+
+
+@pytest.mark.django_db
+def test_render_profile_reports_includes(
+        client, many_posts_with_published_locations
+):
+    with render_profile() as profile:
+        client.get("/")
+    rendered = dict(
+        (name, (calls, total, own))
+        for name, calls, total, own in profile.rows()
+    )
+    for name in (
+        "blog/index.html",
+        "includes/header.html",
+        "includes/paginator.html",
+    ):
+        assert name in rendered, (
+            f"Убедитесь, что профилировщик учитывает шаблон `{name}`."
+        )
+    calls, total, own = rendered["includes/post_card.html"]
+    assert calls == 10
+    assert total >= own
+    assert rendered["base.html"][1] >= total
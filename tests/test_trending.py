@@ -0,0 +1,64 @@
+import math
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import PostActivity, TrendingScore
+from blog.trending_utils import add_activity, growth, update_trending
+
+
+@pytest.mark.django_db
+def test_popular_page_ranks_by_activity(
+        client, mixer, many_posts_with_published_locations
+):
+    quiet, discussed, read = many_posts_with_published_locations[:3]
+    mixer.blend("blog.Comment", post=discussed)
+    add_activity(views={read.pk: 5, quiet.pk: 1})
+    update_trending()
+    assert not PostActivity.objects.exists()
+    assert list(
+        TrendingScore.objects.values_list("post", flat=True)
+    ) == [discussed.pk, read.pk, quiet.pk]
+    response = client.get("/popular/")
+    assert [post.pk for post in response.context["page_obj"]] == [
+        discussed.pk, read.pk, quiet.pk
+    ], "Убедитесь, что популярные посты выводятся по убыванию рейтинга."
+
+
+@pytest.mark.django_db
+def test_scores_accumulate_and_decay(post_with_published_location):
+    post = post_with_published_location
+    add_activity(views={post.pk: 2})
+    update_trending()
+    first = TrendingScore.objects.get(post=post).score
+    add_activity(views={post.pk: 2})
+    update_trending()
+    second = TrendingScore.objects.get(post=post).score
+    assert second == pytest.approx(first + math.log(2), abs=1e-3)
+    update_trending(now=timezone.now() + timedelta(days=30))
+    assert not TrendingScore.objects.exists(), (
+        "Убедитесь, что затухшие рейтинги удаляются."
+    )
+
+
+def test_half_life():
+    now = timezone.now()
+    assert math.log(4) + growth(now - timedelta(days=2)) == pytest.approx(
+        growth(now)
+    )
+
+
+@pytest.mark.django_db
+def test_popular_count_follows_ranking(
+        client, many_posts_with_published_locations
+):
+    first, second = many_posts_with_published_locations[:2]
+    add_activity(views={first.pk: 1})
+    update_trending()
+    assert client.get("/popular/").context["paginator"].count == 1
+    add_activity(views={second.pk: 1})
+    update_trending()
+    assert client.get("/popular/").context["paginator"].count == 2, (
+        "Убедитесь, что число популярных постов обновляется с рейтингом."
+    )
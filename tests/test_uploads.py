@@ -0,0 +1,134 @@
+from io import BytesIO
+
+import pytest
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from PIL import Image
+
+from blog.models import Post
+
+
+def jpeg(size=(100, 100)):
+    data = BytesIO()
+    Image.new("RGB", size).save(data, "JPEG")
+    return data.getvalue()
+
+
+def create_post(client, category, content):
+    return client.post("/posts/create/", {
+        "title": "Заголовок",
+        "text": "Текст",
+        "category": category.pk,
+        "pub_date": "2024-05-01 10:00",
+        "image": SimpleUploadedFile("photo.jpg", content),
+    })
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("limits", "content"),
+    [
+        ({}, b"#!/bin/sh\n" * 100),
+        ({"IMAGE_UPLOAD_MAX_SIZE": 100}, jpeg()),
+        ({"IMAGE_MAX_PIXELS": 99 * 99}, jpeg()),
+    ],
+    ids=["not an image", "too large file", "too many pixels"],
+)
+def test_upload_is_rejected(
+        settings, user_client, published_category, limits, content
+):
+    for name, value in limits.items():
+        setattr(settings, name, value)
+    response = create_post(user_client, published_category, content)
+    assert response.status_code == 200
+    assert "image" in response.context["form"].errors, (
+        "Убедитесь, что неподходящие изображения отклоняются формой."
+    )
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_image_is_uploaded(settings, tmp_path, user_client, published_category):
+    settings.MEDIA_ROOT = tmp_path
+    response = create_post(user_client, published_category, jpeg())
+    assert response.status_code == 302
+    assert Post.objects.get().image.read() == jpeg()
+
+
+@pytest.mark.django_db
+def test_too_long_body_is_not_read(settings, user_client, published_category):
+    settings.IMAGE_UPLOAD_MAX_SIZE = 100
+    settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 100
+    response = create_post(user_client, published_category, jpeg())
+    assert response.status_code == 413, (
+        "Убедитесь, что слишком длинный запрос отклоняется по его длине."
+    )
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_upload_checks_csrf(user, published_category):
+    from django.test import Client
+
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = create_post(client, published_category, jpeg())
+    assert response.status_code == 403, (
+        "Убедитесь, что загрузка изображений проверяет CSRF-токен."
+    )
+
+
+@pytest.mark.django_db
+def test_admin_rejects_not_an_image(admin_client, user, published_category):
+    response = admin_client.post("/admin/blog/post/add/", {
+        "title": "Заголовок",
+        "text": "Текст",
+        "author": user.pk,
+        "category": published_category.pk,
+        "pub_date_0": "2024-05-01",
+        "pub_date_1": "10:00",
+        "is_published": "on",
+        "image": SimpleUploadedFile("photo.jpg", b"#!/bin/sh\n" * 100),
+    })
+    errors = response.context["adminform"].form.errors["image"]
+    assert "JPEG" in errors[0], (
+        "Убедитесь, что админка сообщает, почему файл отклонён."
+    )
+    assert not Post.objects.exists()
+
+
+def refuse_upload(*args, **kwargs):
+    raise AssertionError(
+        "Тело запроса не должно читаться до проверки доступа."
+    )
+
+
+@pytest.mark.django_db
+def test_refused_request_is_not_uploaded(
+        monkeypatch, settings, client, user_client, user, another_user,
+        published_category, post_with_published_location,
+):
+    from blog.throttle_utils import take_token
+    from blog.upload_handlers import ImageUploadHandler
+
+    monkeypatch.setattr(ImageUploadHandler, "new_file", refuse_upload)
+    response = create_post(client, published_category, jpeg())
+    assert response.status_code == 302, (
+        "Убедитесь, что анонимный запрос отклоняется до загрузки файла."
+    )
+    settings.RATE_LIMITS = {"post": "1/h"}
+    caches[settings.RATE_LIMIT_CACHE].clear()
+    take_token("post", f"user:{user.pk}")
+    response = create_post(user_client, published_category, jpeg())
+    caches[settings.RATE_LIMIT_CACHE].clear()
+    assert response.status_code == 429, (
+        "Убедитесь, что ограниченный запрос отклоняется до загрузки файла."
+    )
+    another_client = Client()
+    another_client.force_login(another_user)
+    response = another_client.post(
+        f"/posts/{post_with_published_location.pk}/edit/",
+        {"image": SimpleUploadedFile("photo.jpg", jpeg())},
+    )
+    assert response.status_code == 302
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_header_costs_no_queries(user, user_client):
+    user_client.get("/pages/about/")
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/pages/about/")
+    assert user.username in response.content.decode()
+    assert len(queries) == 0, (
+        "Убедитесь, что сессия и пользователь берутся из кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_drops_cached_user(user):
+    client = Client()
+    client.force_login(user)
+    assert client.get("/pages/about/").context["user"] == user
+    user.set_password("An0ther-secret")
+    user.save()
+    response = client.get("/pages/about/")
+    assert not response.context["user"].is_authenticated, (
+        "Убедитесь, что смена пароля сбрасывает пользователя в кэше."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_edit_drops_cached_user(user, user_client):
+    user_client.get("/pages/about/")
+    user_client.post("/profile/edit/", {
+        "username": "renamed",
+        "first_name": "",
+        "last_name": "",
+        "email": "renamed@example.com",
+    })
+    response = user_client.get("/pages/about/")
+    assert response.context["user"].username == "renamed"
+
+
+@pytest.mark.django_db
+def test_user_not_cached_in_per_process_cache(settings, user, user_client):
+    settings.SINGLE_PROCESS = False
+    user_client.get("/pages/about/")
+    user.__class__.objects.filter(pk=user.pk).update(is_active=False)
+    response = user_client.get("/pages/about/")
+    assert not response.context["user"].is_authenticated, (
+        "Убедитесь, что пользователь не кэшируется в кэше,"
+        " который не видят другие процессы."
+    )
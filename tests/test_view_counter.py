@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import counter_utils
+from blog.counter_utils import view_counter
+from blog.models import Post
+
+
+@pytest.fixture
+def counter(settings):
+    settings.VIEW_FLUSH_INTERVAL = 60 * 60
+    view_counter.take()
+    yield view_counter
+    view_counter.take()
+
+
+@pytest.mark.django_db
+def test_views_written_in_one_update(
+        counter, client, post_with_published_location,
+        posts_with_unpublished_category,
+):
+    post = post_with_published_location
+    hidden = posts_with_unpublished_category[0]
+    with CaptureQueriesContext(connection) as reads:
+        for _ in range(3):
+            client.get(f"/posts/{post.pk}/")
+        client.get(f"/posts/{hidden.pk}/")
+    assert not any(
+        query["sql"].startswith(("UPDATE", "INSERT"))
+        for query in reads.captured_queries
+    ), "Убедитесь, что просмотр поста не пишет в базу данных."
+    with CaptureQueriesContext(connection) as writes:
+        counter.flush()
+    statements = [
+        query["sql"].split()[0] for query in writes.captured_queries
+    ]
+    assert [
+        statement for statement in statements
+        if statement not in ("SAVEPOINT", "RELEASE")
+    ] == [
+        "UPDATE", "INSERT"
+    ], "Убедитесь, что просмотры записываются одним запросом на пачку."
+    post.refresh_from_db()
+    hidden.refresh_from_db()
+    assert (post.view_count, hidden.view_count) == (3, 0)
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_views(counter, monkeypatch):
+    def fail(views):
+        raise RuntimeError
+
+    counter.record(1)
+    monkeypatch.setattr(counter_utils, "add_views", fail)
+    counter.flush()
+    assert counter.views == {1: 1}, (
+        "Убедитесь, что несохранённые просмотры не теряются."
+    )
+
+
+@pytest.mark.django_db
+def test_failed_batch_is_not_counted_twice(counter, monkeypatch, mixer):
+    posts = mixer.cycle(2).blend("blog.Post", view_count=0)
+    add_activity = counter_utils.add_activity
+    calls = []
+
+    def fail_second(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise RuntimeError
+        add_activity(**kwargs)
+
+    monkeypatch.setattr(counter_utils, "BULK_BATCH_SIZE", 1)
+    monkeypatch.setattr(counter_utils, "add_activity", fail_second)
+    for post in posts:
+        counter.record(post.pk)
+    counter.flush()
+    counter.flush()
+    assert [
+        post.view_count for post in Post.objects.filter(pk__in=[
+            post.pk for post in posts
+        ])
+    ] == [1, 1], "Убедитесь, что просмотры не учитываются дважды."
@@ -0,0 +1,58 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog import warm_utils
+
+
+@pytest.mark.django_db
+def test_hot_urls(
+        post_with_published_location, posts_with_unpublished_category
+):
+    post = post_with_published_location
+    urls = warm_utils.hot_urls(pages=3, posts=5)
+    assert urls == [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.pk}/",
+    ], (
+        "Убедитесь, что прогреваются только существующие страницы"
+        " опубликованных категорий."
+    )
+
+
+@pytest.mark.django_db
+def test_warm_cache_command(settings, tmp_path, post_with_published_location):
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tmp_path,
+        },
+    }
+    out = StringIO()
+    call_command("warm_cache", workers=1, stdout=out)
+    output = out.getvalue()
+    assert "[200]" in output and "[404]" not in output
+    assert "Pages warmed: 3" in output
+    assert any(tmp_path.iterdir()), (
+        "Убедитесь, что страницы попадают в общий кэш."
+    )
+
+
+def test_warm_cache_command_needs_shared_cache():
+    with pytest.raises(CommandError):
+        call_command("warm_cache", stdout=StringIO())
+
+
+def test_schedule_merges_calls(settings):
+    settings.WARM_CACHE_DELAY = 60
+    warm_utils.schedule_warm_cache()
+    scheduled = warm_utils._scheduled
+    warm_utils.schedule_warm_cache()
+    assert warm_utils._scheduled is scheduled, (
+        "Убедитесь, что повторные вызовы не запускают прогрев снова."
+    )
+    scheduled.cancel()
+    warm_utils._scheduled = None